@@ -2,6 +2,9 @@
 RAG Knowledge Base for NYSE Company - Example Usage
 
 This file demonstrates how to use the stockrag package.
+
+Profile a run (CPU stacks and memory per stage) without code changes:
+    STOCKRAG_PROFILE=./profile python main.py
 """
 
 import logging
@@ -38,7 +41,7 @@ def main():
 
     # Load data from various sources
     # from stockrag import load_sec_filings, load_company_website, load_news_releases
-    # load_sec_filings(ctx, filing_types=["10-K", "10-Q"])
+    # load_sec_filings(ctx, filing_types=["10-K", "10-Q"], edgar_path="./edgar")
     load_annual_reports(ctx, ["./data/apple_annual_report_2024.pdf"])
     # load_company_website(ctx, urls=[
     #     "https://www.apple.com/investor-relations/",
@@ -47,14 +50,31 @@ def main():
     # load_news_releases(ctx, news_urls=[
     #     "https://www.apple.com/newsroom/2024/01/apple-reports-first-quarter-results/"
     # ])
+    # load_news_releases(ctx, rss_url="https://www.apple.com/newsroom/rss-feed.rss")
 
-    # Build index
+    # Build index; on later runs unchanged sources are skipped before
+    # parsing and the existing index is reused
     build_index(ctx)
 
     # Or load existing index
     # from stockrag import load_existing_index
     # load_existing_index(ctx)
 
+    # Ship a compact snapshot to query nodes instead of the whole store
+    # from stockrag import export_snapshot, import_snapshot
+    # export_snapshot(ctx, "./snapshots/AAPL")
+    # import_snapshot(ctx, "./snapshots/AAPL")  # on the query node
+
+    # Serve queries from a pool of worker processes sharing one index
+    # from stockrag import start_query_workers
+    # with start_query_workers(ctx, workers=4) as pool:
+    #     response = pool.query("What are the main risk factors?")
+
+    # Nightly refresh: unchanged PDFs and pages are skipped before parsing
+    # load_existing_index(ctx)
+    # new_docs = load_annual_reports(ctx, pdf_paths, add_to_context=False)
+    # update_with_new_data(ctx, new_docs)
+
     # Query examples
     response = query(ctx, "What was the revenue in the last fiscal year?")
     print(f"\nAnswer: {response}")
@@ -62,6 +82,14 @@ def main():
     response = query(ctx, "What are the main business segments?")
     print(f"\nAnswer: {response}")
 
+    # Periodic news refresh: indexes only new or changed feed items
+    # from stockrag import refresh_news
+    # refresh_news(ctx, rss_url="https://www.apple.com/newsroom/rss-feed.rss")
+
+    # Numeric lookups answered from the structured fact store (no LLM call)
+    # from stockrag import query_with_facts
+    # response = query_with_facts(ctx, "What was the revenue in the last fiscal year?")
+
     # Query with filters
     # from stockrag import query_with_filters
     # response = query_with_filters(
@@ -21,6 +21,11 @@ from stockrag.core.config import (
     EmbeddingConfig,
     ChunkingConfig,
     VectorStoreConfig,
+    RateLimitConfig,
+    FactsConfig,
+    DocumentConfig,
+    LLMCacheConfig,
+    IngestConfig,
 )
 
 # Context factory
@@ -35,13 +40,40 @@ from stockrag.loaders import (
 )
 
 # Functional API - Index
-from stockrag.index import build_index, load_existing_index
+from stockrag.index import (
+    build_index,
+    load_existing_index,
+    export_snapshot,
+    import_snapshot,
+    evaluate_reduction,
+)
 
 # Functional API - Query
-from stockrag.query import create_query_engine, query, query_with_filters
+from stockrag.query import (
+    create_query_engine,
+    query,
+    query_with_filters,
+    query_with_facts,
+    start_query_workers,
+    publish_snapshot,
+)
+
+# Structured facts
+from stockrag.facts import load_xbrl_facts
 
 # Functional API - Maintenance
-from stockrag.maintenance import update_with_new_data, get_stats
+from stockrag.maintenance import (
+    update_with_new_data,
+    refresh_news,
+    get_stats,
+    benchmark_document_retention,
+    delete_documents,
+    compact_index,
+    recover_compaction,
+)
+
+# LLM scheduling
+from stockrag.llm import LLMScheduler, batch_priority
 
 # Custom exceptions
 from stockrag.core.exceptions import (
@@ -61,6 +93,11 @@ __all__ = [
     "EmbeddingConfig",
     "ChunkingConfig",
     "VectorStoreConfig",
+    "RateLimitConfig",
+    "FactsConfig",
+    "DocumentConfig",
+    "LLMCacheConfig",
+    "IngestConfig",
     "create_context",
     # Loaders
     "load_sec_filings",
@@ -70,13 +107,29 @@ __all__ = [
     # Index
     "build_index",
     "load_existing_index",
+    "export_snapshot",
+    "import_snapshot",
+    "evaluate_reduction",
     # Query
     "create_query_engine",
     "query",
     "query_with_filters",
+    "query_with_facts",
+    "start_query_workers",
+    "publish_snapshot",
+    # Facts
+    "load_xbrl_facts",
     # Maintenance
     "update_with_new_data",
+    "refresh_news",
     "get_stats",
+    "benchmark_document_retention",
+    "delete_documents",
+    "compact_index",
+    "recover_compaction",
+    # LLM scheduling
+    "LLMScheduler",
+    "batch_priority",
     # Exceptions
     "StockRAGError",
     "NoDocumentsError",
@@ -5,6 +5,7 @@ Provides the create_context factory function to initialize RAGContext
 with all necessary LlamaIndex settings and vector store configuration.
 """
 
+import os
 from typing import Optional
 
 from llama_index.core import Settings, StorageContext
@@ -17,6 +18,14 @@ import chromadb
 from stockrag.core.context import RAGContext
 from stockrag.core.config import RAGConfig
 from stockrag.core.exceptions import ConfigurationError
+from stockrag.facts.store import FactStore
+from stockrag.index.reduction import EmbeddingReducer, ReducedEmbedding
+from stockrag.index.spill import RETENTION_MODES, DocumentSpillStore
+from stockrag.llm.scheduler import get_scheduler
+from stockrag.llm.cache import LLMCallCache
+from stockrag.llm.wrapper import CachedLLM, RateLimitedLLM
+from stockrag.loaders.manifest import IngestManifest
+from stockrag.maintenance.compact import recover_compaction
 
 
 def create_context(
@@ -43,6 +52,12 @@ def create_context(
 
 def _initialize_context(ctx: RAGContext, config: RAGConfig) -> None:
     """Initialize LlamaIndex settings and vector store."""
+    if config.documents.retention not in RETENTION_MODES:
+        raise ConfigurationError(
+            f"Unknown document retention '{config.documents.retention}'. "
+            f"Expected one of {RETENTION_MODES}."
+        )
+
     # Validate API key (resolved in LLMConfig.__post_init__ from env)
     if not config.llm.api_key:
         raise ConfigurationError(
@@ -50,16 +65,59 @@ def _initialize_context(ctx: RAGContext, config: RAGConfig) -> None:
         )
 
     # Configure LLM
-    Settings.llm = Groq(
+    llm_kwargs = {}
+    if config.llm.api_base:
+        llm_kwargs["api_base"] = config.llm.api_base
+    if config.rate_limit.enabled:
+        # Scheduler owns retries so backoff is coordinated across callers
+        llm_kwargs["max_retries"] = 0
+
+    llm = Groq(
         model=config.llm.model,
         temperature=config.llm.temperature,
         api_key=config.llm.api_key,
+        **llm_kwargs,
     )
 
+    if config.rate_limit.enabled:
+        ctx.llm_scheduler = get_scheduler(
+            config.rate_limit,
+            api_key=config.llm.api_key,
+            model=config.llm.model,
+            api_base=config.llm.api_base,
+        )
+        llm = RateLimitedLLM(llm=llm, scheduler=ctx.llm_scheduler)
+
+    # Cache outermost so repeated prompts skip rate limit admission too
+    if config.llm_cache.enabled:
+        ctx.llm_cache = LLMCallCache(
+            path=config.llm_cache.path, max_entries=config.llm_cache.max_entries
+        )
+        llm = CachedLLM(
+            llm=llm,
+            cache=ctx.llm_cache,
+            model=config.llm.model,
+            temperature=config.llm.temperature,
+        )
+
+    Settings.llm = llm
+
+    # Initialize vector store path (also holds the embedding projection)
+    persist_path = config.vector_store.persist_path or f"./chroma_db_{ctx.ticker}"
+    ctx.persist_path = persist_path
+
     # Configure embeddings
-    Settings.embed_model = HuggingFaceEmbedding(
-        model_name=config.embedding.model_name
-    )
+    embed_model = HuggingFaceEmbedding(model_name=config.embedding.model_name)
+    if config.embedding.reduction:
+        os.makedirs(persist_path, exist_ok=True)
+        ctx.embedding_reducer = EmbeddingReducer.load_or_create(
+            method=config.embedding.reduction,
+            dim=config.embedding.reduced_dim,
+            model_name=config.embedding.model_name,
+            path=os.path.join(persist_path, "embedding_projection.npz"),
+        )
+        embed_model = ReducedEmbedding(base=embed_model, reducer=ctx.embedding_reducer)
+    Settings.embed_model = embed_model
 
     # Configure chunking
     Settings.node_parser = SentenceSplitter(
@@ -68,14 +126,36 @@ def _initialize_context(ctx: RAGContext, config: RAGConfig) -> None:
     )
 
     # Initialize vector store
-    persist_path = config.vector_store.persist_path or f"./chroma_db_{ctx.ticker}"
     collection_name = (
         config.vector_store.collection_name or f"{ctx.ticker}_knowledge_base"
     )
 
     ctx.chroma_client = chromadb.PersistentClient(path=persist_path)
+    recover_compaction(ctx.chroma_client, collection_name)
     ctx.chroma_collection = ctx.chroma_client.get_or_create_collection(
         name=collection_name
     )
     ctx.vector_store = ChromaVectorStore(chroma_collection=ctx.chroma_collection)
     ctx.storage_context = StorageContext.from_defaults(vector_store=ctx.vector_store)
+
+    # Initialize structured fact store next to the vector store
+    if config.facts.enabled:
+        ctx.fact_store = FactStore(
+            config.facts.db_path or os.path.join(persist_path, "facts.sqlite")
+        )
+
+    # Document text retention after indexing
+    ctx.document_retention = config.documents.retention
+    if ctx.document_retention == "spill":
+        ctx.document_store = DocumentSpillStore(
+            config.documents.spill_path
+            or os.path.join(persist_path, "documents.sqlite")
+        )
+
+    # Record of indexed sources so unchanged ones are not parsed again
+    if config.ingest.enabled:
+        ctx.ingest_manifest = IngestManifest(
+            config.ingest.manifest_path
+            or os.path.join(persist_path, "ingest_manifest.sqlite"),
+            collection_name,
+        )
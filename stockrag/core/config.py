@@ -18,6 +18,7 @@ class LLMConfig:
     model: str = "llama-3.3-70b-versatile"
     temperature: float = 0.1
     api_key: Optional[str] = None
+    api_base: Optional[str] = None  # Override endpoint (e.g. local fake server)
 
     def __post_init__(self):
         if self.api_key is None:
@@ -31,6 +32,8 @@ class EmbeddingConfig:
     provider: str = "huggingface"  # huggingface, openai
     model_name: str = "BAAI/bge-small-en-v1.5"
     # Alternative: "sentence-transformers/all-MiniLM-L6-v2"
+    reduction: Optional[str] = None  # None, "pca", "truncate" (Matryoshka models)
+    reduced_dim: int = 128
 
 
 @dataclass
@@ -50,6 +53,52 @@ class VectorStoreConfig:
     collection_name: Optional[str] = None  # Auto-generated if None
 
 
+@dataclass
+class DocumentConfig:
+    """Retention of loaded document text after indexing."""
+
+    retention: str = "memory"  # memory, spill (compressed on disk), release
+    spill_path: Optional[str] = None  # Defaults to documents.sqlite next to the index
+
+
+@dataclass
+class FactsConfig:
+    """Structured financial fact store configuration."""
+
+    enabled: bool = True
+    db_path: Optional[str] = None  # Defaults to facts.sqlite in the vector store path
+
+
+@dataclass
+class IngestConfig:
+    """Ingest manifest used to skip unchanged source files and URLs."""
+
+    enabled: bool = True
+    manifest_path: Optional[str] = None  # Defaults next to the vector store
+
+
+@dataclass
+class RateLimitConfig:
+    """LLM rate limit scheduling configuration."""
+
+    enabled: bool = False
+    requests_per_minute: int = 30
+    tokens_per_minute: int = 6000
+    max_concurrency: int = 4
+    min_concurrency: int = 1
+    expected_output_tokens: int = 256  # Reserved per call on top of the prompt
+    max_retries: int = 5
+
+
+@dataclass
+class LLMCacheConfig:
+    """Persistent exact-prompt LLM call cache configuration."""
+
+    enabled: bool = False
+    path: Optional[str] = None  # Defaults to ~/.cache/stockrag/llm_cache.sqlite
+    max_entries: int = 100_000
+
+
 @dataclass
 class RAGConfig:
     """
@@ -71,3 +120,8 @@ class RAGConfig:
     embedding: EmbeddingConfig = field(default_factory=EmbeddingConfig)
     chunking: ChunkingConfig = field(default_factory=ChunkingConfig)
     vector_store: VectorStoreConfig = field(default_factory=VectorStoreConfig)
+    rate_limit: RateLimitConfig = field(default_factory=RateLimitConfig)
+    facts: FactsConfig = field(default_factory=FactsConfig)
+    documents: DocumentConfig = field(default_factory=DocumentConfig)
+    ingest: IngestConfig = field(default_factory=IngestConfig)
+    llm_cache: LLMCacheConfig = field(default_factory=LLMCacheConfig)
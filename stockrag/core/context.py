@@ -7,7 +7,7 @@ as their first parameter.
 """
 
 from dataclasses import dataclass, field
-from typing import List, Optional, TYPE_CHECKING
+from typing import List, Optional, TYPE_CHECKING, Union
 
 from llama_index.core import Document, VectorStoreIndex, StorageContext
 
@@ -16,6 +16,12 @@ if TYPE_CHECKING:
     from llama_index.vector_stores.chroma import ChromaVectorStore
     from chromadb import ClientAPI
     from chromadb.api.models.Collection import Collection
+    from stockrag.facts.store import FactStore
+    from stockrag.index.reduction import EmbeddingReducer
+    from stockrag.index.spill import DocumentDescriptor, DocumentSpillStore
+    from stockrag.llm.cache import LLMCallCache
+    from stockrag.loaders.manifest import IngestManifest
+    from stockrag.llm.scheduler import LLMScheduler
 
 
 @dataclass
@@ -26,21 +32,39 @@ class RAGContext:
     Attributes:
         ticker: Company stock ticker symbol
         company_name: Full company name
-        documents: List of loaded documents
+        documents: List of loaded documents (descriptors once released)
         index: VectorStoreIndex instance (after build)
         query_engine: Query engine instance
         vector_store: ChromaVectorStore instance
         storage_context: LlamaIndex StorageContext
         chroma_client: ChromaDB client
         chroma_collection: ChromaDB collection
+        llm_scheduler: Rate limit scheduler (when rate limiting is enabled)
+        llm_cache: Persistent LLM call cache (when caching is enabled)
+        fact_store: Structured financial fact store (when enabled)
+        document_retention: What happens to document text after indexing
+        document_store: Compressed on-disk store for spilled document text
+        summary_collection: ChromaDB collection of document/section summaries
+        persist_path: Directory of the persisted vector store
+        embedding_reducer: Embedding projection (when reduction is enabled)
+        ingest_manifest: Record of indexed sources (when enabled)
     """
 
     ticker: str
     company_name: str
-    documents: List[Document] = field(default_factory=list)
+    documents: List[Union[Document, "DocumentDescriptor"]] = field(default_factory=list)
     index: Optional[VectorStoreIndex] = None
     query_engine: Optional["BaseQueryEngine"] = None
     vector_store: Optional["ChromaVectorStore"] = None
     storage_context: Optional[StorageContext] = None
     chroma_client: Optional["ClientAPI"] = None
     chroma_collection: Optional["Collection"] = None
+    llm_scheduler: Optional["LLMScheduler"] = None
+    llm_cache: Optional["LLMCallCache"] = None
+    fact_store: Optional["FactStore"] = None
+    document_retention: str = "memory"
+    document_store: Optional["DocumentSpillStore"] = None
+    summary_collection: Optional["Collection"] = None
+    persist_path: Optional[str] = None
+    embedding_reducer: Optional["EmbeddingReducer"] = None
+    ingest_manifest: Optional["IngestManifest"] = None
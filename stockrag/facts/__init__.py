@@ -0,0 +1,11 @@
+"""Structured financial facts extracted during ingestion."""
+
+from stockrag.facts.store import FactStore, FinancialFact
+from stockrag.facts.extract import extract_facts, load_xbrl_facts
+
+__all__ = [
+    "FactStore",
+    "FinancialFact",
+    "extract_facts",
+    "load_xbrl_facts",
+]
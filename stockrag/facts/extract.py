@@ -0,0 +1,260 @@
+"""Extraction of financial line items from documents and XBRL facts."""
+
+import json
+import logging
+import os
+import re
+import zipfile
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+from llama_index.core import Document
+
+from stockrag.core.context import RAGContext
+from stockrag.core.exceptions import ConfigurationError
+from stockrag.facts.store import PRIORITY_TEXT, PRIORITY_XBRL, FinancialFact
+
+# Canonical metric -> statement line labels (lowercase, exact match on the label)
+METRIC_LABELS: Dict[str, List[str]] = {
+    "revenue": [
+        "total net sales",
+        "net sales",
+        "total revenues",
+        "total revenue",
+        "revenues",
+        "revenue",
+    ],
+    "net_income": ["net income", "net income (loss)", "net earnings"],
+    "gross_margin": ["total gross margin", "gross margin", "gross profit"],
+    "operating_income": [
+        "operating income",
+        "income from operations",
+        "operating income (loss)",
+    ],
+    "research_and_development": ["research and development"],
+    "total_assets": ["total assets"],
+    "total_liabilities": ["total liabilities"],
+    "cash_and_equivalents": ["cash and cash equivalents"],
+    "operating_cash_flow": [
+        "cash generated by operating activities",
+        "net cash provided by operating activities",
+    ],
+}
+
+# Canonical metric -> us-gaap concepts, in order of preference
+XBRL_CONCEPTS: Dict[str, List[str]] = {
+    "revenue": [
+        "Revenues",
+        "RevenueFromContractWithCustomerExcludingAssessedTax",
+        "SalesRevenueNet",
+    ],
+    "net_income": ["NetIncomeLoss"],
+    "gross_margin": ["GrossProfit"],
+    "operating_income": ["OperatingIncomeLoss"],
+    "research_and_development": ["ResearchAndDevelopmentExpense"],
+    "total_assets": ["Assets"],
+    "total_liabilities": ["Liabilities"],
+    "cash_and_equivalents": ["CashAndCashEquivalentsAtCarryingValue"],
+    "operating_cash_flow": ["NetCashProvidedByUsedInOperatingActivities"],
+}
+
+_LABEL_TO_METRIC = {
+    label: metric for metric, labels in METRIC_LABELS.items() for label in labels
+}
+
+_YEAR_RE = re.compile(r"\b(?:19|20)\d{2}\b")
+_NUMBER_RE = re.compile(r"\(?-?\$?\s?\d[\d,]*(?:\.\d+)?\)?")
+_NUMBER_START_RE = re.compile(r"\(?-?\$?\s?\d")
+_THOUSANDS_RE = re.compile(r"\d,\d{3}")
+_SCALE_RE = re.compile(r"in (thousands|millions|billions)", re.IGNORECASE)
+_SCALES = {"thousands": 1e3, "millions": 1e6, "billions": 1e9}
+
+
+def extract_facts(ctx: RAGContext, documents: Iterable[Document]) -> int:
+    """
+    Extract statement line items from documents into ctx.fact_store.
+
+    Looks for lines such as "Total net sales 391,035 383,285 394,328" under a
+    header naming the fiscal years, scaled by the page's "(In millions ...)"
+    note.
+
+    Args:
+        ctx: RAGContext with fact_store configured
+        documents: Documents to scan (typically annual report pages)
+
+    Returns:
+        Number of facts written
+    """
+    if ctx.fact_store is None:
+        return 0
+
+    facts: List[FinancialFact] = []
+    for doc in documents:
+        location = doc.metadata.get("file_path", doc.metadata.get("url", ""))
+        source = doc.metadata.get("source", "")
+        for metric, year, value in extract_line_items(doc.text):
+            facts.append(
+                FinancialFact(
+                    ticker=ctx.ticker,
+                    metric=metric,
+                    period=f"FY{year}",
+                    value=value,
+                    source=source,
+                    location=location,
+                    priority=PRIORITY_TEXT,
+                )
+            )
+
+    written = ctx.fact_store.upsert(facts)
+    logger.info("Extracted %d financial facts (%d written)", len(facts), written)
+    return written
+
+
+def extract_line_items(text: str) -> List[Tuple[str, int, float]]:
+    """
+    Find (metric, fiscal year, value) triples in statement-like text.
+
+    Args:
+        text: Plain text of a document or page
+
+    Returns:
+        List of (metric, year, value) with values in base units
+    """
+    scale_match = _SCALE_RE.search(text)
+    scale = _SCALES[scale_match.group(1).lower()] if scale_match else 1.0
+
+    items = []
+    years: List[int] = []
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+
+        line_years = [int(y) for y in _YEAR_RE.findall(line)]
+        if (
+            len(set(line_years)) >= 2
+            and len(line) < 160
+            and not _THOUSANDS_RE.search(line)
+        ):
+            years = line_years
+            continue
+
+        if not years:
+            continue
+        first_digit = _NUMBER_START_RE.search(line)
+        if not first_digit:
+            continue
+        label = line[: first_digit.start()].strip(" :$.").lower()
+        metric = _LABEL_TO_METRIC.get(label)
+        if metric is None:
+            continue
+
+        values = []
+        rest = line[first_digit.start() :]
+        for match in _NUMBER_RE.finditer(rest):
+            # Skip percent-change columns such as "2 %" or "(3)%"
+            if rest[match.end() :].lstrip().startswith("%"):
+                continue
+            value = _parse_number(match.group())
+            if value is not None:
+                values.append(value)
+        # Anything but one value per year means the columns were misread
+        if len(values) != len(years):
+            continue
+        for year, value in zip(years, values):
+            items.append((metric, year, value * scale))
+    return items
+
+
+def load_xbrl_facts(
+    ctx: RAGContext,
+    companyfacts_path: str,
+    cik: Optional[str] = None,
+) -> int:
+    """
+    Load annual XBRL facts from an EDGAR companyfacts JSON into ctx.fact_store.
+
+    XBRL facts take precedence over values extracted from document text.
+
+    Args:
+        ctx: RAGContext with fact_store configured
+        companyfacts_path: Path to CIK##########.json, or to companyfacts.zip
+        cik: Company CIK (required when companyfacts_path is a zip)
+
+    Returns:
+        Number of facts written
+
+    Raises:
+        ConfigurationError: If the fact store is disabled or the CIK is missing
+    """
+    if ctx.fact_store is None:
+        raise ConfigurationError("Fact store is disabled (RAGConfig.facts.enabled).")
+
+    if zipfile.is_zipfile(companyfacts_path):
+        if not cik:
+            raise ConfigurationError("cik is required to read companyfacts.zip")
+        with zipfile.ZipFile(companyfacts_path) as zf:
+            data = json.loads(zf.read(f"CIK{int(cik):010d}.json"))
+    else:
+        with open(companyfacts_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+
+    gaap = data.get("facts", {}).get("us-gaap", {})
+    facts: List[FinancialFact] = []
+    for metric, concepts in XBRL_CONCEPTS.items():
+        # Filers switch concepts over the years; earlier concepts win per period
+        values: Dict[str, float] = {}
+        for concept in concepts:
+            entries = gaap.get(concept, {}).get("units", {}).get("USD", [])
+            for period_end, value in _annual_values(entries).items():
+                values.setdefault(period_end, value)
+
+        for period_end, value in values.items():
+            facts.append(
+                FinancialFact(
+                    ticker=ctx.ticker,
+                    metric=metric,
+                    period=f"FY{period_end[:4]}",
+                    value=value,
+                    period_end=period_end,
+                    source="XBRL",
+                    location=os.path.basename(companyfacts_path),
+                    priority=PRIORITY_XBRL,
+                )
+            )
+
+    written = ctx.fact_store.upsert(facts)
+    logger.info("Loaded %d XBRL facts for %s", written, ctx.ticker)
+    return written
+
+
+def _annual_values(entries: List[dict]) -> Dict[str, float]:
+    """Pick one full-year value per period end from 10-K facts."""
+    annual: Dict[str, float] = {}
+    for entry in entries:
+        if not str(entry.get("form", "")).startswith("10-K"):
+            continue
+        start, end = entry.get("start"), entry.get("end")
+        if not end:
+            continue
+        # Duration facts must span roughly a year; instant facts have no start
+        if start and not 350 <= _days_between(start, end) <= 380:
+            continue
+        annual[end] = float(entry["val"])  # Later filings restate earlier ones
+    return annual
+
+
+def _days_between(start: str, end: str) -> int:
+    return (date.fromisoformat(end) - date.fromisoformat(start)).days
+
+
+def _parse_number(token: str) -> Optional[float]:
+    negative = token.startswith("(") and token.endswith(")") or "-" in token
+    cleaned = token.strip("()$- ").replace(",", "").replace("$", "").strip()
+    try:
+        value = float(cleaned)
+    except ValueError:
+        return None
+    return -value if negative else value
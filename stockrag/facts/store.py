@@ -0,0 +1,144 @@
+"""SQLite-backed store of structured financial facts."""
+
+import os
+import sqlite3
+import threading
+from dataclasses import dataclass
+from typing import Iterable, List, Optional
+
+# Higher priority sources win when the same (ticker, metric, period) is seen twice
+PRIORITY_TEXT = 10
+PRIORITY_XBRL = 20
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS facts (
+    ticker TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    period TEXT NOT NULL,
+    value REAL NOT NULL,
+    unit TEXT NOT NULL,
+    period_end TEXT,
+    source TEXT,
+    location TEXT,
+    priority INTEGER NOT NULL,
+    PRIMARY KEY (ticker, metric, period)
+)
+"""
+
+
+@dataclass
+class FinancialFact:
+    """A single numeric line item, e.g. AAPL revenue for FY2024."""
+
+    ticker: str
+    metric: str
+    period: str  # "FY2024"
+    value: float
+    unit: str = "USD"
+    period_end: Optional[str] = None
+    source: str = ""
+    location: str = ""
+    priority: int = PRIORITY_TEXT
+
+
+class FactStore:
+    """
+    Compact local fact store keyed by ticker, metric and period.
+
+    Usage:
+        store = FactStore("./chroma_db_AAPL/facts.sqlite")
+        store.upsert([FinancialFact("AAPL", "revenue", "FY2024", 391.035e9)])
+        store.get("AAPL", "revenue", "FY2024")
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(_SCHEMA)
+        self._conn.commit()
+
+    def upsert(self, facts: Iterable[FinancialFact]) -> int:
+        """
+        Insert facts, replacing existing ones of equal or lower priority.
+
+        Returns:
+            Number of facts written
+        """
+        rows = [
+            (
+                f.ticker,
+                f.metric,
+                f.period,
+                f.value,
+                f.unit,
+                f.period_end,
+                f.source,
+                f.location,
+                f.priority,
+            )
+            for f in facts
+        ]
+        with self._lock, self._conn:
+            before = self._conn.total_changes
+            self._conn.executemany(
+                """
+                INSERT INTO facts VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (ticker, metric, period) DO UPDATE SET
+                    value = excluded.value,
+                    unit = excluded.unit,
+                    period_end = excluded.period_end,
+                    source = excluded.source,
+                    location = excluded.location,
+                    priority = excluded.priority
+                WHERE excluded.priority >= facts.priority
+                """,
+                rows,
+            )
+            return self._conn.total_changes - before
+
+    def get(self, ticker: str, metric: str, period: str) -> Optional[FinancialFact]:
+        """Look up one fact, or None if it is not stored."""
+        rows = self._select(
+            "WHERE ticker = ? AND metric = ? AND period = ?", (ticker, metric, period)
+        )
+        return rows[0] if rows else None
+
+    def periods(self, ticker: str, metric: str) -> List[str]:
+        """Stored periods for a metric, most recent first."""
+        with self._lock:
+            cur = self._conn.execute(
+                "SELECT period FROM facts WHERE ticker = ? AND metric = ? "
+                "ORDER BY period DESC",
+                (ticker, metric),
+            )
+            return [row[0] for row in cur.fetchall()]
+
+    def facts(self, ticker: str) -> List[FinancialFact]:
+        """All facts stored for a ticker."""
+        return self._select("WHERE ticker = ? ORDER BY metric, period", (ticker,))
+
+    def delete(self, ticker: str, source: Optional[str] = None) -> int:
+        """Delete a ticker's facts (optionally only from one source)."""
+        sql, params = "DELETE FROM facts WHERE ticker = ?", [ticker]
+        if source is not None:
+            sql += " AND source = ?"
+            params.append(source)
+        with self._lock, self._conn:
+            return self._conn.execute(sql, params).rowcount
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _select(self, where: str, params: tuple) -> List[FinancialFact]:
+        with self._lock:
+            cur = self._conn.execute(
+                "SELECT ticker, metric, period, value, unit, period_end, source, "
+                f"location, priority FROM facts {where}",
+                params,
+            )
+            return [FinancialFact(*row) for row in cur.fetchall()]
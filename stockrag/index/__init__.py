@@ -1,9 +1,20 @@
 """Index building and persistence operations."""
 
 from stockrag.index.builder import build_index
-from stockrag.index.persistence import load_existing_index
+from stockrag.index.persistence import (
+    export_snapshot,
+    import_snapshot,
+    load_existing_index,
+)
+from stockrag.index.hierarchy import build_summary_index, update_summary_index
+from stockrag.index.reduction import evaluate_reduction
 
 __all__ = [
     "build_index",
     "load_existing_index",
+    "export_snapshot",
+    "import_snapshot",
+    "build_summary_index",
+    "update_summary_index",
+    "evaluate_reduction",
 ]
@@ -2,39 +2,98 @@
 
 import logging
 
-from llama_index.core import VectorStoreIndex
+from llama_index.core import Document, VectorStoreIndex
 
 logger = logging.getLogger(__name__)
 
 from stockrag.core.context import RAGContext
 from stockrag.core.exceptions import NoDocumentsError
+from stockrag.facts.extract import extract_facts
+from stockrag.index.hierarchy import (
+    build_summary_index,
+    document_keys,
+    get_summary_collection,
+    update_summary_index,
+)
+from stockrag.index.persistence import load_existing_index
+from stockrag.index.reduction import fit_reduction
+from stockrag.index.spill import release_documents
+from stockrag.profiling import profiled
 
 
-def build_index(ctx: RAGContext, show_progress: bool = True) -> VectorStoreIndex:
+@profiled
+def build_index(
+    ctx: RAGContext,
+    show_progress: bool = True,
+    hierarchical: bool = False,
+) -> VectorStoreIndex:
     """
     Build vector index from loaded documents.
 
+    Only Documents still held in memory are indexed: descriptors left by
+    release_documents belong to an earlier build, and with an ingest
+    manifest loaders skip sources that are already indexed and unchanged.
+    If nothing is left to index, the existing index is loaded instead.
+
     Args:
         ctx: RAGContext with documents loaded
         show_progress: Show indexing progress bar
+        hierarchical: Also build per-document and per-section summary
+            vectors for two-stage retrieval
 
     Returns:
         VectorStoreIndex instance (also stored in ctx.index)
 
     Raises:
-        NoDocumentsError: If no documents are loaded
+        NoDocumentsError: If no documents are loaded and there is no
+            existing index to use
     """
-    logger.info("Building index from %d documents...", len(ctx.documents))
-
-    if not ctx.documents:
+    # Released documents (descriptors) were indexed by an earlier build
+    documents = [d for d in ctx.documents if isinstance(d, Document)]
+    if not documents:
+        # Everything loaded is already indexed, or the manifest skipped it
+        already_indexed = ctx.documents or ctx.ingest_manifest is not None
+        if already_indexed and ctx.chroma_collection.count() > 0:
+            logger.info("No new or changed documents; using the existing index")
+            load_existing_index(ctx)
+            if hierarchical and get_summary_collection(ctx) is None:
+                build_summary_index(ctx)
+            return ctx.index
         raise NoDocumentsError()
 
+    logger.info("Building index from %d documents...", len(documents))
+
     # Create index
-    ctx.index = VectorStoreIndex.from_documents(
-        ctx.documents,
-        storage_context=ctx.storage_context,
-        show_progress=show_progress,
-    )
+    if ctx.embedding_reducer is not None and not ctx.embedding_reducer.fitted:
+        # PCA must see full-dimension embeddings before anything is stored
+        nodes = fit_reduction(ctx, documents, show_progress=show_progress)
+        ctx.index = VectorStoreIndex(
+            nodes,
+            storage_context=ctx.storage_context,
+            show_progress=show_progress,
+        )
+    else:
+        ctx.index = VectorStoreIndex.from_documents(
+            documents,
+            storage_context=ctx.storage_context,
+            show_progress=show_progress,
+        )
+
+    # Record which sources are now indexed (replacing chunks of changed ones)
+    if ctx.ingest_manifest is not None:
+        ctx.ingest_manifest.commit(ctx.chroma_collection)
+
+    if hierarchical:
+        build_summary_index(ctx)
+    elif get_summary_collection(ctx) is not None:
+        # Queries route through existing summaries; keep them in step
+        update_summary_index(ctx, document_keys(documents))
+
+    # Structured facts for the numeric fast path
+    extract_facts(ctx, documents)
+
+    # Drop document text from memory per ctx.document_retention
+    release_documents(ctx)
 
     logger.info("Index built successfully!")
     return ctx.index
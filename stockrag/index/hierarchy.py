@@ -0,0 +1,270 @@
+"""Per-document and per-section summary vectors for two-stage retrieval."""
+
+import json
+import logging
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+from stockrag.core.context import RAGContext
+from stockrag.core.exceptions import IndexNotBuiltError
+
+LEVEL_DOCUMENT = "document"
+LEVEL_SECTION = "section"
+
+
+def summary_collection_name(ctx: RAGContext) -> str:
+    return f"{ctx.chroma_collection.name}_summaries"
+
+
+def get_summary_collection(ctx: RAGContext) -> Optional[Any]:
+    """
+    Return the summary collection for ctx, if one has been built.
+
+    Caches the collection in ctx.summary_collection.
+    """
+    if ctx.summary_collection is None and ctx.chroma_client is not None:
+        try:
+            ctx.summary_collection = ctx.chroma_client.get_collection(
+                summary_collection_name(ctx)
+            )
+        except Exception:
+            return None
+    return ctx.summary_collection
+
+
+def build_summary_index(
+    ctx: RAGContext,
+    section_size: int = 8,
+    batch_size: int = 1000,
+) -> int:
+    """
+    Build the summary level of a hierarchical index.
+
+    Each document (chunks sharing a file_path/url, or a ref_doc_id) gets
+    one summary vector and each run of up to `section_size` consecutive
+    chunks of a loaded Document gets one section vector. Summary vectors
+    are the normalized centroids of their chunk embeddings, so no extra
+    embedding or LLM calls are made.
+
+    Args:
+        ctx: RAGContext with index built
+        section_size: Maximum chunks per section
+        batch_size: Records read and written per call
+
+    Returns:
+        Number of summary vectors written
+
+    Raises:
+        IndexNotBuiltError: If the vector store is not configured
+    """
+    if ctx.chroma_collection is None:
+        raise IndexNotBuiltError()
+
+    logger.info("Building summary index...")
+
+    records = _summary_records(_iter_chunks(ctx.chroma_collection, None, batch_size))
+    ids, embeddings, metadatas = records.build(section_size)
+
+    # Rebuild from scratch so removed chunks never linger in summaries
+    name = summary_collection_name(ctx)
+    try:
+        ctx.chroma_client.delete_collection(name)
+    except Exception:
+        pass
+    ctx.summary_collection = ctx.chroma_client.create_collection(
+        name=name, metadata={"hnsw:space": "cosine", "section_size": section_size}
+    )
+    _add_summaries(ctx.summary_collection, ids, embeddings, metadatas, batch_size)
+
+    logger.info(
+        "Summary index built: %d documents, %d sections",
+        len(records.documents),
+        len(ids) - len(records.documents),
+    )
+    return len(ids)
+
+
+def update_summary_index(
+    ctx: RAGContext,
+    document_keys: Iterable[str],
+    batch_size: int = 1000,
+) -> int:
+    """
+    Recompute the summaries of some documents after their chunks changed.
+
+    Summary entries of the given documents are dropped and rebuilt from
+    the chunks they have now, so the cost is proportional to those
+    documents rather than to the corpus. Documents with no chunks left
+    simply lose their summaries.
+
+    Args:
+        ctx: RAGContext with a summary index built
+        document_keys: Keys (see document_key) of added, changed or
+            deleted documents
+        batch_size: Records read and written per call
+
+    Returns:
+        Number of summary vectors written
+
+    Raises:
+        IndexNotBuiltError: If there is no summary index
+    """
+    summaries = get_summary_collection(ctx)
+    if summaries is None:
+        raise IndexNotBuiltError("No summary index to update.")
+
+    keys = sorted(set(document_keys))
+    if not keys:
+        return 0
+    section_size = (summaries.metadata or {}).get("section_size", 8)
+
+    for start in range(0, len(keys), batch_size):
+        summaries.delete(
+            where={"document_key": {"$in": keys[start : start + batch_size]}}
+        )
+
+    # Chunks carry the key in one of several fields; match any, then filter
+    where = {
+        "$or": [
+            {field: {"$in": keys}}
+            for field in ("file_path", "url", "accession_number", "ref_doc_id")
+        ]
+    }
+    wanted = set(keys)
+    chunks = (
+        chunk
+        for chunk in _iter_chunks(ctx.chroma_collection, where, batch_size)
+        if document_key(chunk[2]) in wanted
+    )
+    ids, embeddings, metadatas = _summary_records(chunks).build(section_size)
+    _add_summaries(summaries, ids, embeddings, metadatas, batch_size)
+
+    logger.info("Summary index updated for %d documents", len(keys))
+    return len(ids)
+
+
+class _SummaryRecords:
+    """Chunk embeddings grouped by document and by loaded Document."""
+
+    def __init__(self) -> None:
+        self.documents: Dict[str, List[np.ndarray]] = {}
+        self.sections: Dict[Tuple[str, str], List[Tuple[str, np.ndarray]]] = {}
+        self.doc_metadata: Dict[str, Dict[str, Any]] = {}
+
+    def add(self, node_id: str, vector: np.ndarray, metadata: Dict[str, Any]) -> None:
+        doc_key = document_key(metadata)
+        self.documents.setdefault(doc_key, []).append(vector)
+        self.sections.setdefault((doc_key, metadata.get("ref_doc_id", "")), []).append(
+            (node_id, vector)
+        )
+        self.doc_metadata.setdefault(doc_key, metadata)
+
+    def build(
+        self, section_size: int
+    ) -> Tuple[List[str], List[List[float]], List[Dict[str, Any]]]:
+        ids: List[str] = []
+        embeddings: List[List[float]] = []
+        metadatas: List[Dict[str, Any]] = []
+
+        for doc_key, vectors in self.documents.items():
+            ids.append(f"doc::{doc_key}")
+            embeddings.append(_centroid(vectors))
+            metadatas.append(
+                {
+                    "level": LEVEL_DOCUMENT,
+                    "document_key": doc_key,
+                    "source": self.doc_metadata[doc_key].get("source", "Unknown"),
+                }
+            )
+
+        for (doc_key, ref_doc_id), members in self.sections.items():
+            for start in range(0, len(members), section_size):
+                group = members[start : start + section_size]
+                ids.append(f"section::{doc_key}::{ref_doc_id}::{start}")
+                embeddings.append(_centroid([v for _, v in group]))
+                metadatas.append(
+                    {
+                        "level": LEVEL_SECTION,
+                        "document_key": doc_key,
+                        "node_ids": json.dumps([node_id for node_id, _ in group]),
+                    }
+                )
+        return ids, embeddings, metadatas
+
+
+def _summary_records(
+    chunks: Iterator[Tuple[str, List[float], Dict[str, Any]]],
+) -> _SummaryRecords:
+    records = _SummaryRecords()
+    for node_id, embedding, metadata in chunks:
+        records.add(node_id, np.asarray(embedding, dtype=np.float32), metadata)
+    return records
+
+
+def _iter_chunks(
+    collection: Any, where: Optional[Dict[str, Any]], batch_size: int
+) -> Iterator[Tuple[str, List[float], Dict[str, Any]]]:
+    """Yield (id, embedding, metadata) for the chunks matching where."""
+    offset = 0
+    while True:
+        page = collection.get(
+            where=where,
+            limit=batch_size,
+            offset=offset,
+            include=["embeddings", "metadatas"],
+        )
+        if not page["ids"]:
+            return
+        for node_id, embedding, metadata in zip(
+            page["ids"], page["embeddings"], page["metadatas"]
+        ):
+            yield node_id, embedding, metadata or {}
+        offset += len(page["ids"])
+
+
+def _add_summaries(
+    collection: Any,
+    ids: List[str],
+    embeddings: List[List[float]],
+    metadatas: List[Dict[str, Any]],
+    batch_size: int,
+) -> None:
+    for start in range(0, len(ids), batch_size):
+        collection.add(
+            ids=ids[start : start + batch_size],
+            embeddings=embeddings[start : start + batch_size],
+            metadatas=metadatas[start : start + batch_size],
+        )
+
+
+def drop_summary_index(ctx: RAGContext) -> None:
+    """Delete ctx's summary collection, if any, so queries stop routing through it."""
+    if get_summary_collection(ctx) is not None:
+        ctx.chroma_client.delete_collection(summary_collection_name(ctx))
+        ctx.summary_collection = None
+
+
+def document_keys(documents: Iterable[Any]) -> Set[str]:
+    """Keys of the documents the chunks of these loaded Documents belong to."""
+    return {
+        document_key(dict(doc.metadata, ref_doc_id=doc.doc_id)) for doc in documents
+    }
+
+
+def document_key(metadata: Dict[str, Any]) -> str:
+    """Key grouping chunks into one document: file path, URL, filing or ref doc."""
+    return str(
+        metadata.get("file_path")
+        or metadata.get("url")
+        or metadata.get("accession_number")
+        or metadata.get("ref_doc_id", "unknown")
+    )
+
+
+def _centroid(vectors: List[np.ndarray]) -> List[float]:
+    mean = np.mean(np.stack(vectors), axis=0)
+    norm = np.linalg.norm(mean)
+    return (mean / norm if norm > 0 else mean).tolist()
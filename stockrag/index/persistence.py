@@ -1,12 +1,37 @@
 """Index persistence operations."""
 
+import gzip
+import json
 import logging
+import os
+import shutil
+from datetime import datetime
+from typing import Any, Dict, Optional
 
-from llama_index.core import VectorStoreIndex
+import numpy as np
+
+from llama_index.core import Settings, StorageContext, VectorStoreIndex
+from llama_index.vector_stores.chroma import ChromaVectorStore
 
 logger = logging.getLogger(__name__)
 
 from stockrag.core.context import RAGContext
+from stockrag.core.exceptions import (
+    ConfigurationError,
+    IndexNotBuiltError,
+    StockRAGError,
+)
+from stockrag.index.hierarchy import (
+    build_summary_index,
+    drop_summary_index,
+    get_summary_collection,
+)
+
+SNAPSHOT_FORMAT = 1
+MANIFEST_FILE = "manifest.json"
+EMBEDDINGS_FILE = "embeddings.npy"
+RECORDS_FILE = "records.jsonl.gz"
+PROJECTION_FILE = "embedding_projection.npz"
 
 
 def load_existing_index(ctx: RAGContext) -> VectorStoreIndex:
@@ -28,3 +53,315 @@ def load_existing_index(ctx: RAGContext) -> VectorStoreIndex:
 
     logger.info("Index loaded successfully!")
     return ctx.index
+
+
+def rebind_collection(ctx: RAGContext, collection: Any) -> None:
+    """Point ctx's vector store, storage context and index at a new collection."""
+    ctx.chroma_collection = collection
+    ctx.vector_store = ChromaVectorStore(chroma_collection=collection)
+    ctx.storage_context = StorageContext.from_defaults(vector_store=ctx.vector_store)
+    if ctx.index is not None:
+        ctx.index = VectorStoreIndex.from_vector_store(
+            ctx.vector_store, storage_context=ctx.storage_context
+        )
+    ctx.query_engine = None
+
+
+def export_snapshot(
+    ctx: RAGContext, path: str, batch_size: int = 1000
+) -> Dict[str, Any]:
+    """
+    Write a compact, portable snapshot of the index.
+
+    The snapshot directory holds:
+
+        manifest.json           Format version, counts and model/chunking config
+        embeddings.npy          float16 (n, dim) array, memory-mappable
+        records.jsonl.gz        One {"id", "document", "metadata"} line per chunk
+        embedding_projection.npz  Fitted PCA projection, if reduction is used
+
+    float16 halves vector storage and changes cosine scores by well under
+    1e-3, which does not affect ranking in practice.
+
+    Args:
+        ctx: RAGContext with index built
+        path: Snapshot directory (created; existing files are overwritten)
+        batch_size: Records read per call
+
+    Returns:
+        The snapshot manifest
+
+    Raises:
+        IndexNotBuiltError: If the vector store is not configured or is empty
+    """
+    collection = ctx.chroma_collection
+    if collection is None:
+        raise IndexNotBuiltError()
+    count = collection.count()
+    if count == 0:
+        raise IndexNotBuiltError("Index is empty; nothing to export.")
+
+    logger.info("Exporting %d chunks to snapshot %s...", count, path)
+    os.makedirs(path, exist_ok=True)
+
+    embeddings: Optional[np.ndarray] = None
+    written = 0
+    with gzip.open(os.path.join(path, RECORDS_FILE), "wt", encoding="utf-8") as f:
+        while written < count:
+            page = collection.get(
+                limit=batch_size,
+                offset=written,
+                include=["embeddings", "documents", "metadatas"],
+            )
+            if not page["ids"]:
+                break
+            vectors = np.asarray(page["embeddings"], dtype=np.float16)
+            if embeddings is None:
+                embeddings = np.lib.format.open_memmap(
+                    os.path.join(path, EMBEDDINGS_FILE),
+                    mode="w+",
+                    dtype=np.float16,
+                    shape=(count, vectors.shape[1]),
+                )
+            embeddings[written : written + len(vectors)] = vectors
+            for record_id, document, metadata in zip(
+                page["ids"], page["documents"], page["metadatas"]
+            ):
+                f.write(
+                    json.dumps(
+                        {"id": record_id, "document": document, "metadata": metadata}
+                    )
+                )
+                f.write("\n")
+            written += len(page["ids"])
+
+    dim = embeddings.shape[1]
+    embeddings.flush()
+    del embeddings
+    if written != count:
+        # Collection changed while exporting; trim to what was written
+        _truncate_embeddings(os.path.join(path, EMBEDDINGS_FILE), written, dim)
+
+    reducer = ctx.embedding_reducer
+    projection = os.path.join(path, PROJECTION_FILE)
+    if reducer is not None and reducer.path and os.path.exists(reducer.path):
+        shutil.copyfile(reducer.path, projection)
+    elif os.path.exists(projection):
+        os.remove(projection)
+
+    manifest = {
+        "format": SNAPSHOT_FORMAT,
+        "created": datetime.now().isoformat(),
+        "ticker": ctx.ticker,
+        "collection": collection.name,
+        "collection_metadata": collection.metadata or None,
+        "count": written,
+        "dim": dim,
+        "dtype": "float16",
+        "hierarchical": get_summary_collection(ctx) is not None,
+        "embedding": _embedding_config(ctx),
+        "chunking": _chunking_config(),
+    }
+    with open(os.path.join(path, MANIFEST_FILE), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+
+    logger.info(
+        "Snapshot written: %d chunks, %d dimensions, %d bytes",
+        written,
+        dim,
+        sum(os.path.getsize(os.path.join(path, f)) for f in os.listdir(path)),
+    )
+    return manifest
+
+
+def import_snapshot(
+    ctx: RAGContext,
+    path: str,
+    overwrite: bool = False,
+    batch_size: int = 5000,
+) -> VectorStoreIndex:
+    """
+    Bulk-load a snapshot written by export_snapshot into ctx's vector store.
+
+    No documents are re-parsed or re-embedded. The snapshot's embedding
+    model and reduction must match ctx's configuration.
+
+    Args:
+        ctx: RAGContext created with the snapshot's embedding configuration
+        path: Snapshot directory
+        overwrite: Replace a non-empty collection instead of failing
+        batch_size: Records written per call
+
+    Returns:
+        VectorStoreIndex instance (also stored in ctx.index)
+
+    Raises:
+        ConfigurationError: If the snapshot is incompatible with ctx, or the
+            collection is not empty and overwrite is False
+        StockRAGError: If the snapshot is missing or of a newer format
+    """
+    if ctx.chroma_client is None or ctx.chroma_collection is None:
+        raise IndexNotBuiltError("Vector store is not configured.")
+
+    manifest = read_manifest(path)
+    check_compatible(ctx, manifest)
+
+    name = ctx.chroma_collection.name
+    collection = ctx.chroma_collection
+    if collection.count() > 0 and not overwrite:
+        raise ConfigurationError(
+            f"Collection {name} is not empty; pass overwrite=True to replace it."
+        )
+    if collection.count() > 0 or (
+        (collection.metadata or None) != manifest["collection_metadata"]
+    ):
+        # Start from a fresh collection with the exporting store's distance
+        ctx.chroma_client.delete_collection(name)
+        collection = ctx.chroma_client.create_collection(
+            name=name, metadata=manifest["collection_metadata"]
+        )
+
+    logger.info("Importing %d chunks from snapshot %s...", manifest["count"], path)
+
+    embeddings = np.load(os.path.join(path, EMBEDDINGS_FILE), mmap_mode="r")
+    ids, documents, metadatas = [], [], []
+    offset = 0
+    with gzip.open(os.path.join(path, RECORDS_FILE), "rt", encoding="utf-8") as f:
+        for line in f:
+            record = json.loads(line)
+            ids.append(record["id"])
+            documents.append(record["document"])
+            metadatas.append(record["metadata"])
+            if len(ids) == batch_size:
+                _add_batch(collection, embeddings, offset, ids, documents, metadatas)
+                offset += len(ids)
+                ids, documents, metadatas = [], [], []
+    if ids:
+        _add_batch(collection, embeddings, offset, ids, documents, metadatas)
+        offset += len(ids)
+
+    if offset != manifest["count"]:
+        raise StockRAGError(
+            f"Snapshot {path} is truncated: {offset} of {manifest['count']} records."
+        )
+
+    restore_projection(ctx, path)
+    rebind_collection(ctx, collection)
+    if manifest["hierarchical"]:
+        build_summary_index(ctx)
+    else:
+        # Old summaries point at chunks that were just replaced
+        drop_summary_index(ctx)
+
+    logger.info("Snapshot imported: %d chunks", offset)
+    return load_existing_index(ctx)
+
+
+def read_manifest(path: str) -> Dict[str, Any]:
+    """
+    Read and validate a snapshot's manifest.
+
+    Raises:
+        StockRAGError: If the snapshot is missing or of a newer format
+    """
+    manifest_path = os.path.join(path, MANIFEST_FILE)
+    if not os.path.exists(manifest_path):
+        raise StockRAGError(f"No index snapshot found at {path}.")
+    with open(manifest_path, encoding="utf-8") as f:
+        manifest = json.load(f)
+    if manifest.get("format", 0) > SNAPSHOT_FORMAT:
+        raise StockRAGError(
+            f"Snapshot format {manifest.get('format')} is newer than supported "
+            f"({SNAPSHOT_FORMAT}); upgrade stockrag."
+        )
+    return manifest
+
+
+def _add_batch(
+    collection: Any,
+    embeddings: np.ndarray,
+    offset: int,
+    ids: list,
+    documents: list,
+    metadatas: list,
+) -> None:
+    vectors = np.asarray(embeddings[offset : offset + len(ids)], dtype=np.float32)
+    collection.add(
+        ids=ids,
+        embeddings=vectors.tolist(),
+        documents=documents,
+        metadatas=metadatas,
+    )
+
+
+def _embedding_config(ctx: RAGContext) -> Dict[str, Any]:
+    reducer = ctx.embedding_reducer
+    return {
+        "model_name": getattr(Settings.embed_model, "model_name", None),
+        "reduction": reducer.method if reducer is not None else None,
+        "reduced_dim": reducer.dim if reducer is not None else None,
+    }
+
+
+def _chunking_config() -> Dict[str, Any]:
+    parser = Settings.node_parser
+    return {
+        "chunk_size": getattr(parser, "chunk_size", None),
+        "chunk_overlap": getattr(parser, "chunk_overlap", None),
+    }
+
+
+def check_compatible(ctx: RAGContext, manifest: Dict[str, Any]) -> None:
+    """
+    Check that ctx embeds queries the same way as the snapshot's index.
+
+    Raises:
+        ConfigurationError: If the embedding model or reduction differs
+    """
+    expected = manifest["embedding"]
+    actual = _embedding_config(ctx)
+    for key in ("model_name", "reduction", "reduced_dim"):
+        if expected.get(key) != actual[key]:
+            raise ConfigurationError(
+                f"Snapshot was built with embedding {key}={expected.get(key)!r}, "
+                f"but this context uses {actual[key]!r}."
+            )
+
+    # Chunking only affects documents added later, so mismatches are allowed
+    if manifest["chunking"] != _chunking_config():
+        logger.warning(
+            "Snapshot chunking %s differs from current %s; new documents will "
+            "be chunked differently",
+            manifest["chunking"],
+            _chunking_config(),
+        )
+
+
+def restore_projection(ctx: RAGContext, path: str) -> None:
+    """Install the snapshot's PCA projection so queries are projected the same way."""
+    reducer = ctx.embedding_reducer
+    if reducer is None or not load_projection(reducer, path):
+        return
+    if reducer.path:
+        shutil.copyfile(os.path.join(path, PROJECTION_FILE), reducer.path)
+
+
+def load_projection(reducer: Any, path: str) -> bool:
+    """
+    Load a snapshot's PCA projection into reducer, in memory only.
+
+    Returns:
+        False if the snapshot has no projection
+    """
+    source = os.path.join(path, PROJECTION_FILE)
+    if not os.path.exists(source):
+        return False
+    data = np.load(source)
+    reducer.mean = data["mean"]
+    reducer.components = data["components"]
+    return True
+
+
+def _truncate_embeddings(path: str, rows: int, dim: int) -> None:
+    data = np.array(np.load(path, mmap_mode="r")[:rows])
+    np.save(path, data.reshape(rows, dim))
@@ -0,0 +1,283 @@
+"""Embedding dimensionality reduction (PCA or Matryoshka truncation)."""
+
+import logging
+import os
+import random
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+from llama_index.core import Document, Settings
+from llama_index.core.base.embeddings.base import BaseEmbedding
+from llama_index.core.bridge.pydantic import Field, PrivateAttr
+from llama_index.core.schema import BaseNode, MetadataMode
+
+from stockrag.core.context import RAGContext
+from stockrag.core.exceptions import ConfigurationError, IndexNotBuiltError
+
+REDUCTION_METHODS = ("pca", "truncate")
+
+
+class EmbeddingReducer:
+    """
+    Projection applied to both stored chunk and query embeddings.
+
+    "pca" projects onto the top principal components fitted on ingested
+    embeddings; "truncate" keeps the leading dimensions, which is only
+    meaningful for Matryoshka-trained models. Outputs are L2-normalized.
+    """
+
+    def __init__(self, method: str, dim: int, model_name: str, path: Optional[str]):
+        if method not in REDUCTION_METHODS:
+            raise ConfigurationError(
+                f"Unknown embedding reduction '{method}'. "
+                f"Expected one of {REDUCTION_METHODS}."
+            )
+        self.method = method
+        self.dim = dim
+        self.model_name = model_name
+        self.path = path
+        self.mean: Optional[np.ndarray] = None
+        self.components: Optional[np.ndarray] = None
+
+    @property
+    def fitted(self) -> bool:
+        return self.method == "truncate" or self.components is not None
+
+    def fit(self, vectors: np.ndarray, max_samples: int = 20000) -> None:
+        """Fit PCA on a (n, d) matrix of full-dimension embeddings."""
+        if self.method == "truncate":
+            return
+        if len(vectors) > max_samples:
+            rows = np.random.default_rng(0).choice(len(vectors), max_samples, False)
+            vectors = vectors[rows]
+        self.mean = vectors.mean(axis=0)
+        _, _, vt = np.linalg.svd(vectors - self.mean, full_matrices=False)
+        if vt.shape[0] < self.dim:
+            logger.warning(
+                "Only %d samples to fit PCA; reducing to %d dimensions instead of %d",
+                vt.shape[0],
+                vt.shape[0],
+                self.dim,
+            )
+        # All components stay in memory so evaluate_reduction can compare
+        # wider dimensions; save() persists only the configured ones
+        self.components = vt
+
+    def transform(self, vectors: np.ndarray, dim: Optional[int] = None) -> np.ndarray:
+        """
+        Project (n, d) embeddings to `dim` (default: the configured dimension).
+
+        Raises:
+            ConfigurationError: If `dim` exceeds the fitted PCA components
+        """
+        if self.method == "truncate":
+            reduced = vectors[:, : dim or self.dim]
+        elif self.components is None:
+            return vectors
+        else:
+            available = self.components.shape[0]
+            if dim is None:
+                dim = min(self.dim, available)
+            elif dim > available:
+                raise ConfigurationError(
+                    f"Projection has {available} components; cannot reduce to "
+                    f"{dim} dimensions without refitting."
+                )
+            reduced = (vectors - self.mean) @ self.components[:dim].T
+        norms = np.linalg.norm(reduced, axis=1, keepdims=True)
+        return reduced / np.where(norms > 0, norms, 1.0)
+
+    def save(self) -> None:
+        if self.path is None or self.components is None:
+            return
+        np.savez(
+            self.path,
+            method=self.method,
+            model_name=self.model_name,
+            mean=self.mean,
+            components=self.components[: self.dim],
+        )
+
+    @classmethod
+    def load_or_create(
+        cls, method: str, dim: int, model_name: str, path: str
+    ) -> "EmbeddingReducer":
+        """Load a fitted projection from `path`, or start an unfitted one."""
+        reducer = cls(method, dim, model_name, path)
+        if method == "pca" and os.path.exists(path):
+            data = np.load(path)
+            if str(data["model_name"]) != model_name or str(data["method"]) != method:
+                raise ConfigurationError(
+                    f"Embedding projection at {path} was fitted for "
+                    f"{data['method']}/{data['model_name']}; rebuild the index."
+                )
+            reducer.mean = data["mean"]
+            reducer.components = data["components"]
+        return reducer
+
+
+class ReducedEmbedding(BaseEmbedding):
+    """Embedding model wrapper that applies an EmbeddingReducer."""
+
+    base: BaseEmbedding = Field(description="Full-dimension embedding model.")
+    _reducer: EmbeddingReducer = PrivateAttr()
+
+    def __init__(
+        self, base: BaseEmbedding, reducer: EmbeddingReducer, **kwargs: Any
+    ) -> None:
+        super().__init__(
+            base=base,
+            model_name=base.model_name,
+            embed_batch_size=base.embed_batch_size,
+            **kwargs,
+        )
+        self._reducer = reducer
+
+    @classmethod
+    def class_name(cls) -> str:
+        return "ReducedEmbedding"
+
+    @property
+    def reducer(self) -> EmbeddingReducer:
+        return self._reducer
+
+    def _reduce(self, vectors: List[List[float]]) -> List[List[float]]:
+        return self._reducer.transform(np.asarray(vectors, dtype=np.float32)).tolist()
+
+    def _get_query_embedding(self, query: str) -> List[float]:
+        return self._reduce([self.base.get_query_embedding(query)])[0]
+
+    async def _aget_query_embedding(self, query: str) -> List[float]:
+        return self._reduce([await self.base.aget_query_embedding(query)])[0]
+
+    def _get_text_embedding(self, text: str) -> List[float]:
+        return self._reduce([self.base.get_text_embedding(text)])[0]
+
+    def _get_text_embeddings(self, texts: List[str]) -> List[List[float]]:
+        return self._reduce(self.base.get_text_embedding_batch(texts))
+
+
+def fit_reduction(
+    ctx: RAGContext, documents: List[Document], show_progress: bool = True
+) -> List[BaseNode]:
+    """
+    Chunk and embed documents at full dimension, fit the projection on them,
+    and return nodes carrying their projected embeddings.
+
+    Args:
+        ctx: RAGContext with embedding_reducer configured
+        documents: Documents about to be indexed
+        show_progress: Show embedding progress bar
+
+    Returns:
+        Nodes ready for VectorStoreIndex (embeddings already set)
+    """
+    reducer = ctx.embedding_reducer
+    base = Settings.embed_model.base
+
+    nodes = Settings.node_parser.get_nodes_from_documents(
+        documents, show_progress=show_progress
+    )
+    texts = [node.get_content(metadata_mode=MetadataMode.EMBED) for node in nodes]
+    vectors = np.asarray(
+        base.get_text_embedding_batch(texts, show_progress=show_progress),
+        dtype=np.float32,
+    )
+
+    reducer.fit(vectors)
+    reducer.save()
+    reduced = reducer.transform(vectors)
+    logger.info(
+        "Fitted %s projection: %d -> %d dimensions",
+        reducer.method,
+        vectors.shape[1],
+        reduced.shape[1],
+    )
+
+    for node, vector in zip(nodes, reduced):
+        node.embedding = vector.tolist()
+    return nodes
+
+
+def evaluate_reduction(
+    ctx: RAGContext,
+    questions: Optional[List[str]] = None,
+    dims: Optional[List[int]] = None,
+    k: int = 5,
+    sample_size: int = 2000,
+) -> Dict[int, float]:
+    """
+    Compare retrieval recall@k of reduced embeddings against full dimension.
+
+    Re-embeds a sample of stored chunks at full dimension and, for each
+    question (or, if none are given, the opening of sampled chunks), checks
+    how many of the full-dimension top-k chunks the reduced search finds.
+    A PCA projection loaded from disk only holds the configured components,
+    so wider candidate dimensions are scored with a projection fitted on
+    the sampled corpus.
+
+    Args:
+        ctx: RAGContext with an index built using embedding reduction
+        questions: Evaluation questions (defaults to pseudo-queries)
+        dims: Candidate dimensions (defaults to the configured one)
+        k: Cutoff for recall@k
+        sample_size: Stored chunks sampled as the search corpus
+
+    Returns:
+        Mapping of dimension -> mean recall@k (1.0 at full dimension)
+
+    Raises:
+        IndexNotBuiltError: If no reduction is configured or the index is empty
+        ConfigurationError: If a dimension exceeds what the sample can fit
+    """
+    reducer = ctx.embedding_reducer
+    if reducer is None or ctx.chroma_collection is None:
+        raise IndexNotBuiltError("Embedding reduction is not configured.")
+
+    texts = ctx.chroma_collection.get(limit=sample_size, include=["documents"])[
+        "documents"
+    ]
+    texts = [t for t in texts or [] if t]
+    if not texts:
+        raise IndexNotBuiltError()
+
+    base = Settings.embed_model.base
+    corpus = np.asarray(base.get_text_embedding_batch(texts), dtype=np.float32)
+    if questions is None:
+        rng = random.Random(0)
+        questions = [t[:200] for t in rng.sample(texts, min(50, len(texts)))]
+    queries = np.asarray(
+        [base.get_query_embedding(q) for q in questions], dtype=np.float32
+    )
+
+    k = min(k, len(texts))
+    truth = _top_k(_normalize(corpus), _normalize(queries), k)
+
+    results = {}
+    for dim in dims or [reducer.dim]:
+        projection = reducer
+        if reducer.method == "pca" and (
+            reducer.components is None or dim > reducer.components.shape[0]
+        ):
+            projection = EmbeddingReducer("pca", dim, reducer.model_name, None)
+            projection.fit(corpus)
+        found = _top_k(
+            projection.transform(corpus, dim), projection.transform(queries, dim), k
+        )
+        overlap = [len(set(t) & set(f)) / k for t, f in zip(truth, found)]
+        results[dim] = float(np.mean(overlap))
+        logger.info("recall@%d at %d dimensions: %.3f", k, dim, results[dim])
+    return results
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms > 0, norms, 1.0)
+
+
+def _top_k(corpus: np.ndarray, queries: np.ndarray, k: int) -> List[List[int]]:
+    scores = queries @ corpus.T
+    return np.argsort(-scores, axis=1)[:, :k].tolist()
@@ -0,0 +1,177 @@
+"""Release or spill document text after indexing."""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import zlib
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+from llama_index.core import Document
+
+from stockrag.core.context import RAGContext
+from stockrag.core.exceptions import StockRAGError
+
+RETENTION_MODES = ("memory", "spill", "release")
+
+
+@dataclass
+class DocumentDescriptor:
+    """
+    Lightweight stand-in for an indexed Document.
+
+    Keeps the metadata (so get_stats and source reporting still work) but
+    not the text. With a spill store attached, load() restores the full
+    Document from disk on demand.
+    """
+
+    doc_id: str
+    source: str
+    location: str
+    hash: str
+    size: int
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    store: Optional["DocumentSpillStore"] = field(
+        default=None, repr=False, compare=False
+    )
+
+    def load(self) -> Document:
+        """Load the full Document back from the spill store."""
+        if self.store is None:
+            raise StockRAGError(
+                f"Text of document {self.doc_id} was released after indexing."
+            )
+        return self.store.get(self.doc_id)
+
+    @property
+    def text(self) -> str:
+        return self.load().text
+
+
+class DocumentSpillStore:
+    """
+    Compressed on-disk store of document text and metadata.
+
+    Usage:
+        store = DocumentSpillStore("./chroma_db_AAPL/documents.sqlite")
+        descriptors = store.put_many(ctx.documents)
+        doc = descriptors[0].load()
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS documents "
+            "(doc_id TEXT PRIMARY KEY, hash TEXT NOT NULL, data BLOB NOT NULL)"
+        )
+        self._conn.commit()
+
+    def put_many(self, docs: List[Document]) -> List[DocumentDescriptor]:
+        """Spill documents to disk and return their descriptors."""
+        descriptors = [describe(doc, store=self) for doc in docs]
+        rows = [
+            (
+                d.doc_id,
+                d.hash,
+                zlib.compress(
+                    json.dumps({"text": doc.text, "metadata": doc.metadata}).encode(
+                        "utf-8"
+                    )
+                ),
+            )
+            for d, doc in zip(descriptors, docs)
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO documents VALUES (?, ?, ?)", rows
+            )
+        return descriptors
+
+    def get(self, doc_id: str) -> Document:
+        """Load one spilled Document."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM documents WHERE doc_id = ?", (doc_id,)
+            ).fetchone()
+        if row is None:
+            raise StockRAGError(f"Document {doc_id} not found in spill store.")
+        data = json.loads(zlib.decompress(row[0]).decode("utf-8"))
+        return Document(text=data["text"], metadata=data["metadata"], id_=doc_id)
+
+    def delete(self, doc_ids: List[str]) -> None:
+        """Remove spilled documents."""
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "DELETE FROM documents WHERE doc_id = ?", [(i,) for i in doc_ids]
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def describe(
+    doc: Document, store: Optional[DocumentSpillStore] = None
+) -> DocumentDescriptor:
+    """Build a descriptor for a Document."""
+    text = doc.text or ""
+    return DocumentDescriptor(
+        doc_id=doc.doc_id,
+        source=doc.metadata.get("source", "Unknown"),
+        location=doc.metadata.get("file_path", doc.metadata.get("url", "")),
+        hash=hashlib.sha256(text.encode("utf-8")).hexdigest(),
+        size=len(text),
+        metadata=dict(doc.metadata),
+        store=store,
+    )
+
+
+def release_documents(ctx: RAGContext) -> int:
+    """
+    Replace in-memory Documents in ctx.documents with descriptors.
+
+    Applies ctx.document_retention: "spill" writes the text to
+    ctx.document_store first, "release" drops it, "memory" is a no-op.
+
+    Args:
+        ctx: RAGContext after indexing
+
+    Returns:
+        Number of characters of text released from memory
+    """
+    if ctx.document_retention == "memory":
+        return 0
+
+    pending = [d for d in ctx.documents if isinstance(d, Document)]
+    if not pending:
+        return 0
+
+    if ctx.document_retention == "spill":
+        descriptors = iter(ctx.document_store.put_many(pending))
+    else:
+        descriptors = iter([describe(doc) for doc in pending])
+
+    released = sum(len(doc.text or "") for doc in pending)
+    ctx.documents = [
+        next(descriptors) if isinstance(d, Document) else d for d in ctx.documents
+    ]
+
+    logger.info(
+        "Released %d documents (%d characters) from memory", len(pending), released
+    )
+    return released
+
+
+def materialize(documents: List[Any]) -> List[Document]:
+    """Load full Documents for any descriptors in the list."""
+    return [d.load() if isinstance(d, DocumentDescriptor) else d for d in documents]
@@ -0,0 +1,19 @@
+"""LLM call scheduling and wrappers."""
+
+from stockrag.llm.cache import LLMCallCache
+from stockrag.llm.scheduler import (
+    LLMScheduler,
+    TokenBucket,
+    batch_priority,
+    estimate_tokens,
+    get_scheduler,
+)
+
+__all__ = [
+    "LLMCallCache",
+    "LLMScheduler",
+    "TokenBucket",
+    "batch_priority",
+    "estimate_tokens",
+    "get_scheduler",
+]
@@ -0,0 +1,128 @@
+"""Persistent exact-prompt cache of LLM calls."""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = os.path.join(
+    os.path.expanduser("~"), ".cache", "stockrag", "llm_cache.sqlite"
+)
+
+
+def cache_key(
+    model: str, temperature: float, kind: str, payload: Any, **kwargs: Any
+) -> str:
+    """Hash of everything that determines an LLM call's output."""
+    blob = json.dumps(
+        {
+            "model": model,
+            "temperature": temperature,
+            "kind": kind,
+            "payload": payload,
+            "kwargs": kwargs,
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+class LLMCallCache:
+    """
+    Size-bounded LRU cache of LLM responses in a host-wide SQLite file.
+
+    SQLite's WAL mode lets several processes on one host read and write the
+    same cache, so batch replays and interactive servers share results.
+
+    Usage:
+        cache = LLMCallCache(max_entries=100_000)
+        key = cache_key("llama-3.3-70b-versatile", 0.1, "complete", prompt)
+        cached = cache.get(key)
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        max_entries: int = 100_000,
+        evict_every: int = 100,
+    ):
+        self.path = path or DEFAULT_CACHE_PATH
+        self.max_entries = max_entries
+        self._evict_every = evict_every
+        self._writes = 0
+        self._hits = 0
+        self._misses = 0
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, last_access REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS llm_cache_access ON llm_cache (last_access)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached response payload, or None on a miss."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self._misses += 1
+                return None
+            self._hits += 1
+            with self._conn:
+                self._conn.execute(
+                    "UPDATE llm_cache SET last_access = ? WHERE key = ?",
+                    (time.time(), key),
+                )
+        return json.loads(row[0])
+
+    def put(self, key: str, value: Dict[str, Any]) -> None:
+        """Store a response payload, evicting least recently used entries."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache VALUES (?, ?, ?)",
+                (key, json.dumps(value), time.time()),
+            )
+            self._writes += 1
+            if self._writes % self._evict_every == 0:
+                self._evict()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            (entries,) = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()
+        return {"entries": entries, "hits": self._hits, "misses": self._misses}
+
+    def clear(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM llm_cache")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _evict(self) -> None:
+        (entries,) = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()
+        excess = entries - self.max_entries
+        if excess > 0:
+            self._conn.execute(
+                "DELETE FROM llm_cache WHERE key IN ("
+                "SELECT key FROM llm_cache ORDER BY last_access ASC LIMIT ?)",
+                (excess,),
+            )
+            logger.debug("Evicted %d LLM cache entries", excess)
@@ -0,0 +1,189 @@
+"""Local OpenAI-compatible LLM endpoint that enforces rate limits, for testing."""
+
+import json
+import logging
+import threading
+import time
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+from stockrag.llm.scheduler import TokenBucket, estimate_tokens
+
+
+class RateLimitError(Exception):
+    """HTTP 429 from the endpoint, shaped like provider SDK errors."""
+
+    status_code = 429
+
+    def __init__(self, message: str, response: Any):
+        super().__init__(message)
+        self.response = response
+
+
+class FakeLLMEndpoint:
+    """
+    Threaded HTTP server answering /chat/completions and /completions.
+
+    Requests beyond the configured requests/tokens per minute get a 429
+    with a Retry-After header, like a provider enforcing account limits.
+    Point LLMConfig.api_base at `url` to run stockrag against it, or use
+    complete() to drive an LLMScheduler directly.
+
+    Usage:
+        with FakeLLMEndpoint(requests_per_minute=60) as endpoint:
+            scheduler.run(lambda: endpoint.complete(prompt), prompt)
+            print(endpoint.stats())
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: float = 60,
+        tokens_per_minute: float = 100_000,
+        burst: Optional[float] = None,
+        retry_after: float = 1.0,
+        latency: float = 0.0,
+        reply: str = "OK",
+    ):
+        self.retry_after = retry_after
+        self.latency = latency
+        self.reply = reply
+        self._requests = TokenBucket(requests_per_minute, capacity=burst)
+        self._tokens = TokenBucket(tokens_per_minute)
+        self._lock = threading.Lock()
+        self._served = 0
+        self._throttled = 0
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> "FakeLLMEndpoint":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def close(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "FakeLLMEndpoint":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"served": self._served, "throttled": self._throttled}
+
+    def complete(self, prompt: str, timeout: float = 10.0) -> str:
+        """
+        Send one completion request.
+
+        Raises:
+            RateLimitError: If the endpoint throttled the request
+        """
+        request = urllib.request.Request(
+            f"{self.url}/completions",
+            data=json.dumps({"prompt": prompt}).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=timeout) as response:
+                body = json.load(response)
+        except urllib.error.HTTPError as e:
+            if e.code != 429:
+                raise
+            raise RateLimitError("rate limited", response=e) from e
+        return body["choices"][0]["text"]
+
+    def _admit(self, tokens: int) -> bool:
+        with self._lock:
+            if self._requests.wait_time(1) > 0 or self._tokens.wait_time(tokens) > 0:
+                self._throttled += 1
+                return False
+            self._requests.consume(1)
+            self._tokens.consume(tokens)
+            self._served += 1
+            return True
+
+    def _handler(self) -> type:
+        endpoint = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self) -> None:
+                length = int(self.headers.get("Content-Length") or 0)
+                payload = json.loads(self.rfile.read(length) or b"{}")
+                chat = self.path.endswith("/chat/completions")
+                if chat:
+                    prompt = "\n".join(
+                        str(m.get("content") or "") for m in payload.get("messages", [])
+                    )
+                else:
+                    prompt = str(payload.get("prompt", ""))
+                tokens = estimate_tokens(prompt)
+
+                if not endpoint._admit(tokens):
+                    self._send(
+                        429,
+                        {"error": {"type": "rate_limit_exceeded"}},
+                        {"Retry-After": str(endpoint.retry_after)},
+                    )
+                    return
+
+                if endpoint.latency:
+                    time.sleep(endpoint.latency)
+                if chat:
+                    choice = {
+                        "index": 0,
+                        "message": {"role": "assistant", "content": endpoint.reply},
+                        "finish_reason": "stop",
+                    }
+                else:
+                    choice = {
+                        "index": 0,
+                        "text": endpoint.reply,
+                        "finish_reason": "stop",
+                    }
+                self._send(
+                    200,
+                    {
+                        "id": "fake",
+                        "object": "chat.completion" if chat else "text_completion",
+                        "model": payload.get("model", "fake"),
+                        "choices": [choice],
+                        "usage": {
+                            "prompt_tokens": tokens,
+                            "completion_tokens": 1,
+                            "total_tokens": tokens + 1,
+                        },
+                    },
+                )
+
+            def _send(
+                self,
+                status: int,
+                body: Dict[str, Any],
+                headers: Optional[Dict[str, str]] = None,
+            ) -> None:
+                data = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                logger.debug(format, *args)
+
+        return Handler
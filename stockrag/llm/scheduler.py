@@ -0,0 +1,326 @@
+"""Rate-limit-aware scheduling of LLM calls."""
+
+import contextlib
+import heapq
+import itertools
+import logging
+import threading
+import time
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+from stockrag.core.config import RateLimitConfig
+from stockrag.core.exceptions import ConfigurationError
+
+# Lower value is admitted first
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BATCH = 10
+
+_current_priority: ContextVar[int] = ContextVar(
+    "stockrag_llm_priority", default=PRIORITY_INTERACTIVE
+)
+
+_schedulers: Dict[Tuple[Optional[str], str, Optional[str]], "LLMScheduler"] = {}
+_schedulers_lock = threading.Lock()
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the number of tokens in a prompt.
+
+    Uses the ~4 characters per token rule of thumb, which is close enough
+    for admission control without loading a tokenizer.
+
+    Args:
+        text: Prompt text
+
+    Returns:
+        Estimated token count (at least 1)
+    """
+    return max(1, len(text) // 4)
+
+
+@contextlib.contextmanager
+def batch_priority() -> Iterator[None]:
+    """
+    Run LLM calls made inside the block at batch priority.
+
+    Usage:
+        with batch_priority():
+            for question in nightly_questions:
+                query(ctx, question)
+    """
+    token = _current_priority.set(PRIORITY_BATCH)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+def is_rate_limit_error(exc: BaseException) -> bool:
+    """Return True if the exception represents an HTTP 429 from the provider."""
+    if getattr(exc, "status_code", None) == 429:
+        return True
+    response = getattr(exc, "response", None)
+    if getattr(response, "status_code", None) == 429:
+        return True
+    return type(exc).__name__ == "RateLimitError"
+
+
+def _retry_after(exc: BaseException) -> Optional[float]:
+    """Extract the Retry-After delay (seconds) from a rate limit error."""
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    value = headers.get("retry-after") if hasattr(headers, "get") else None
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """
+    Token bucket refilled continuously at a per-minute rate.
+
+    Not thread-safe on its own; LLMScheduler guards it with its lock.
+    """
+
+    def __init__(
+        self,
+        per_minute: float,
+        capacity: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.capacity = float(capacity if capacity is not None else per_minute)
+        self.rate = per_minute / 60.0
+        self.tokens = self.capacity
+        self._clock = clock
+        self._last = clock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until `amount` tokens are available (0 if available now)."""
+        self._refill()
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.rate
+
+    def consume(self, amount: float) -> None:
+        """Remove tokens; the balance may go negative to record overuse."""
+        self._refill()
+        self.tokens -= amount
+
+    def drain(self) -> None:
+        """Empty the bucket (used after the provider reports throttling)."""
+        self._refill()
+        self.tokens = min(self.tokens, 0.0)
+
+
+class LLMScheduler:
+    """
+    Admission control for LLM calls against provider rate limits.
+
+    Calls are admitted in priority order (interactive before batch, FIFO
+    within a priority) once both the request and token buckets have
+    capacity and the adaptive concurrency limit allows it. On a 429 the
+    concurrency limit is halved and admissions pause; each success grows
+    it back additively (AIMD).
+
+    Usage:
+        scheduler = LLMScheduler(RateLimitConfig(requests_per_minute=30))
+        text = scheduler.run(lambda: llm.complete(prompt), prompt)
+    """
+
+    def __init__(
+        self,
+        config: RateLimitConfig,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.config = config
+        self._clock = clock
+        self._requests = TokenBucket(config.requests_per_minute, clock=clock)
+        self._tokens = TokenBucket(config.tokens_per_minute, clock=clock)
+        self._cond = threading.Condition()
+        self._queue: list = []
+        self._seq = itertools.count()
+        self._in_flight = 0
+        self._limit = float(config.max_concurrency)
+        self._paused_until = 0.0
+        self._admitted = 0
+        self._throttled = 0
+
+    @property
+    def concurrency_limit(self) -> int:
+        """Current adaptive concurrency limit."""
+        return max(self.config.min_concurrency, int(self._limit))
+
+    def run(
+        self,
+        fn: Callable[[], Any],
+        prompt: str,
+        priority: Optional[int] = None,
+    ) -> Any:
+        """
+        Run an LLM call once admitted, retrying on rate limit errors.
+
+        Args:
+            fn: Zero-argument callable performing the provider call
+            prompt: Prompt text used to estimate token usage
+            priority: Admission priority (defaults to the current context's)
+
+        Returns:
+            Whatever `fn` returns
+        """
+        estimate = estimate_tokens(prompt) + self.config.expected_output_tokens
+        priority = _current_priority.get() if priority is None else priority
+
+        for attempt in range(self.config.max_retries + 1):
+            self.acquire(estimate, priority)
+            try:
+                result = fn()
+            except Exception as e:
+                throttled = is_rate_limit_error(e)
+                self.release(
+                    estimate,
+                    throttled=throttled,
+                    retry_after=_retry_after(e),
+                    succeeded=False,
+                )
+                if not throttled or attempt == self.config.max_retries:
+                    raise
+                logger.warning(
+                    "LLM rate limited (attempt %d/%d), concurrency now %d",
+                    attempt + 1,
+                    self.config.max_retries + 1,
+                    self.concurrency_limit,
+                )
+                continue
+            self.release(estimate, used_tokens=_usage_tokens(result))
+            return result
+
+    def acquire(self, estimate: int, priority: int = PRIORITY_INTERACTIVE) -> None:
+        """Block until a call with `estimate` tokens may be sent."""
+        entry = (priority, next(self._seq))
+        with self._cond:
+            heapq.heappush(self._queue, entry)
+            try:
+                while True:
+                    wait = self._admission_wait(entry, estimate)
+                    if wait == 0.0:
+                        heapq.heappop(self._queue)
+                        self._requests.consume(1)
+                        self._tokens.consume(estimate)
+                        self._in_flight += 1
+                        self._admitted += 1
+                        self._cond.notify_all()
+                        return
+                    self._cond.wait(timeout=wait)
+            except BaseException:
+                if entry in self._queue:
+                    self._queue.remove(entry)
+                    heapq.heapify(self._queue)
+                self._cond.notify_all()
+                raise
+
+    def release(
+        self,
+        estimate: int,
+        used_tokens: Optional[int] = None,
+        throttled: bool = False,
+        retry_after: Optional[float] = None,
+        succeeded: bool = True,
+    ) -> None:
+        """
+        Return a slot after a call finished and adapt the concurrency limit.
+
+        A rate limit error halves the limit and only a successful call
+        grows it; other failures leave it unchanged.
+        """
+        with self._cond:
+            self._in_flight -= 1
+            if throttled:
+                self._throttled += 1
+                self._limit = max(float(self.config.min_concurrency), self._limit / 2)
+                self._requests.drain()
+                self._tokens.drain()
+                pause = (
+                    retry_after
+                    if retry_after is not None
+                    else 60.0 / max(1, self.config.requests_per_minute)
+                )
+                self._paused_until = max(self._paused_until, self._clock() + pause)
+            elif succeeded:
+                self._limit = min(
+                    float(self.config.max_concurrency), self._limit + 1.0 / self._limit
+                )
+                if used_tokens is not None:
+                    # Reconcile the reservation with the reported usage
+                    self._tokens.consume(used_tokens - estimate)
+            self._cond.notify_all()
+
+    def _admission_wait(self, entry: Tuple[int, int], estimate: int) -> Optional[float]:
+        """Seconds to wait before `entry` may be admitted; None waits for notify."""
+        if self._queue[0] != entry or self._in_flight >= self.concurrency_limit:
+            return None
+        now = self._clock()
+        if now < self._paused_until:
+            return self._paused_until - now
+        return max(self._requests.wait_time(1), self._tokens.wait_time(estimate))
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of scheduler state for monitoring."""
+        with self._cond:
+            return {
+                "admitted": self._admitted,
+                "throttled": self._throttled,
+                "in_flight": self._in_flight,
+                "queued": len(self._queue),
+                "concurrency_limit": self.concurrency_limit,
+            }
+
+
+def _usage_tokens(result: Any) -> Optional[int]:
+    """Total tokens reported by an OpenAI-compatible response, if present."""
+    raw = getattr(result, "raw", None)
+    usage = raw.get("usage") if isinstance(raw, dict) else getattr(raw, "usage", None)
+    if usage is None:
+        return None
+    if isinstance(usage, dict):
+        return usage.get("total_tokens")
+    return getattr(usage, "total_tokens", None)
+
+
+def get_scheduler(
+    config: RateLimitConfig,
+    api_key: Optional[str],
+    model: str,
+    api_base: Optional[str] = None,
+) -> LLMScheduler:
+    """
+    Get the process-wide scheduler for an account and model.
+
+    Provider limits apply per account, so every context using the same
+    API key, model and endpoint shares one scheduler.
+
+    Raises:
+        ConfigurationError: If a scheduler for the same account and model
+            already exists with a different RateLimitConfig
+    """
+    key = (api_key, model, api_base)
+    with _schedulers_lock:
+        if key not in _schedulers:
+            _schedulers[key] = LLMScheduler(config)
+        elif _schedulers[key].config != config:
+            raise ConfigurationError(
+                f"A rate limit scheduler for model {model} already exists with "
+                f"{_schedulers[key].config}; contexts sharing an API key and "
+                "model must use the same RateLimitConfig."
+            )
+        return _schedulers[key]
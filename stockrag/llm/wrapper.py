@@ -0,0 +1,317 @@
+"""LlamaIndex LLM wrappers for scheduling and caching provider calls."""
+
+import asyncio
+from typing import Any, Sequence
+
+from llama_index.core.base.llms.types import (
+    ChatMessage,
+    ChatResponse,
+    ChatResponseAsyncGen,
+    ChatResponseGen,
+    CompletionResponse,
+    CompletionResponseAsyncGen,
+    CompletionResponseGen,
+    LLMMetadata,
+    MessageRole,
+)
+from llama_index.core.bridge.pydantic import Field, PrivateAttr
+from llama_index.core.llms import LLM
+
+from stockrag.llm.cache import LLMCallCache, cache_key
+from stockrag.llm.scheduler import (
+    LLMScheduler,
+    _current_priority,
+    _retry_after,
+    _usage_tokens,
+    estimate_tokens,
+    is_rate_limit_error,
+)
+
+
+def _messages_text(messages: Sequence[ChatMessage]) -> str:
+    return "\n".join(str(m.content or "") for m in messages)
+
+
+class RateLimitedLLM(LLM):
+    """
+    Delegating LLM that admits every call through an LLMScheduler.
+
+    The response synthesizer sees a normal LLM; only the timing of
+    provider calls changes. Streaming calls hold their slot until the
+    stream is exhausted.
+    """
+
+    llm: LLM = Field(description="Wrapped provider LLM.")
+    _scheduler: LLMScheduler = PrivateAttr()
+
+    def __init__(self, llm: LLM, scheduler: LLMScheduler, **kwargs: Any) -> None:
+        super().__init__(llm=llm, **kwargs)
+        self._scheduler = scheduler
+
+    @classmethod
+    def class_name(cls) -> str:
+        return "RateLimitedLLM"
+
+    @property
+    def metadata(self) -> LLMMetadata:
+        return self.llm.metadata
+
+    @property
+    def scheduler(self) -> LLMScheduler:
+        return self._scheduler
+
+    def chat(self, messages: Sequence[ChatMessage], **kwargs: Any) -> ChatResponse:
+        return self._scheduler.run(
+            lambda: self.llm.chat(messages, **kwargs), _messages_text(messages)
+        )
+
+    def complete(
+        self, prompt: str, formatted: bool = False, **kwargs: Any
+    ) -> CompletionResponse:
+        return self._scheduler.run(
+            lambda: self.llm.complete(prompt, formatted=formatted, **kwargs), prompt
+        )
+
+    def stream_chat(
+        self, messages: Sequence[ChatMessage], **kwargs: Any
+    ) -> ChatResponseGen:
+        return self._stream(
+            lambda: self.llm.stream_chat(messages, **kwargs), _messages_text(messages)
+        )
+
+    def stream_complete(
+        self, prompt: str, formatted: bool = False, **kwargs: Any
+    ) -> CompletionResponseGen:
+        return self._stream(
+            lambda: self.llm.stream_complete(prompt, formatted=formatted, **kwargs),
+            prompt,
+        )
+
+    async def achat(
+        self, messages: Sequence[ChatMessage], **kwargs: Any
+    ) -> ChatResponse:
+        return await self._arun(
+            lambda: self.llm.achat(messages, **kwargs), _messages_text(messages)
+        )
+
+    async def acomplete(
+        self, prompt: str, formatted: bool = False, **kwargs: Any
+    ) -> CompletionResponse:
+        return await self._arun(
+            lambda: self.llm.acomplete(prompt, formatted=formatted, **kwargs), prompt
+        )
+
+    async def astream_chat(
+        self, messages: Sequence[ChatMessage], **kwargs: Any
+    ) -> ChatResponseAsyncGen:
+        return self._astream(
+            lambda: self.llm.astream_chat(messages, **kwargs), _messages_text(messages)
+        )
+
+    async def astream_complete(
+        self, prompt: str, formatted: bool = False, **kwargs: Any
+    ) -> CompletionResponseAsyncGen:
+        return self._astream(
+            lambda: self.llm.astream_complete(prompt, formatted=formatted, **kwargs),
+            prompt,
+        )
+
+    def _estimate(self, prompt: str) -> int:
+        return estimate_tokens(prompt) + self._scheduler.config.expected_output_tokens
+
+    def _stream(self, start: Any, prompt: str) -> Any:
+        estimate = self._estimate(prompt)
+        priority = _current_priority.get()
+
+        def gen() -> Any:
+            self._scheduler.acquire(estimate, priority)
+            throttled = failed = False
+            try:
+                yield from start()
+            except Exception as e:
+                throttled = is_rate_limit_error(e)
+                failed = True
+                raise
+            finally:
+                self._scheduler.release(
+                    estimate, throttled=throttled, succeeded=not failed
+                )
+
+        return gen()
+
+    async def _arun(self, start: Any, prompt: str) -> Any:
+        scheduler = self._scheduler
+        estimate = self._estimate(prompt)
+        priority = _current_priority.get()
+        for attempt in range(scheduler.config.max_retries + 1):
+            await asyncio.to_thread(scheduler.acquire, estimate, priority)
+            try:
+                result = await start()
+            except Exception as e:
+                throttled = is_rate_limit_error(e)
+                scheduler.release(
+                    estimate,
+                    throttled=throttled,
+                    retry_after=_retry_after(e),
+                    succeeded=False,
+                )
+                if not throttled or attempt == scheduler.config.max_retries:
+                    raise
+                continue
+            scheduler.release(estimate, used_tokens=_usage_tokens(result))
+            return result
+
+    def _astream(self, start: Any, prompt: str) -> Any:
+        estimate = self._estimate(prompt)
+        priority = _current_priority.get()
+
+        async def gen() -> Any:
+            await asyncio.to_thread(self._scheduler.acquire, estimate, priority)
+            throttled = failed = False
+            try:
+                async for chunk in await start():
+                    yield chunk
+            except Exception as e:
+                throttled = is_rate_limit_error(e)
+                failed = True
+                raise
+            finally:
+                self._scheduler.release(
+                    estimate, throttled=throttled, succeeded=not failed
+                )
+
+        return gen()
+
+
+class CachedLLM(LLM):
+    """
+    Delegating LLM that serves repeated chat/complete calls from an LLMCallCache.
+
+    Keys cover model, temperature, the full prompt or message list and any
+    call kwargs, so only exact repeats hit. Streaming calls pass through.
+    """
+
+    llm: LLM = Field(description="Wrapped LLM.")
+    model: str = Field(description="Model name used in cache keys.")
+    temperature: float = Field(description="Temperature used in cache keys.")
+    _cache: LLMCallCache = PrivateAttr()
+
+    def __init__(
+        self,
+        llm: LLM,
+        cache: LLMCallCache,
+        model: str,
+        temperature: float,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(llm=llm, model=model, temperature=temperature, **kwargs)
+        self._cache = cache
+
+    @classmethod
+    def class_name(cls) -> str:
+        return "CachedLLM"
+
+    @property
+    def metadata(self) -> LLMMetadata:
+        return self.llm.metadata
+
+    @property
+    def cache(self) -> LLMCallCache:
+        return self._cache
+
+    def chat(self, messages: Sequence[ChatMessage], **kwargs: Any) -> ChatResponse:
+        key = self._chat_key(messages, kwargs)
+        cached = self._cache.get(key)
+        if cached is not None:
+            return _chat_response(cached)
+        response = self.llm.chat(messages, **kwargs)
+        self._cache.put(key, _chat_payload(response))
+        return response
+
+    def complete(
+        self, prompt: str, formatted: bool = False, **kwargs: Any
+    ) -> CompletionResponse:
+        key = self._complete_key(prompt, formatted, kwargs)
+        cached = self._cache.get(key)
+        if cached is not None:
+            return CompletionResponse(text=cached["text"])
+        response = self.llm.complete(prompt, formatted=formatted, **kwargs)
+        self._cache.put(key, {"text": response.text})
+        return response
+
+    def stream_chat(
+        self, messages: Sequence[ChatMessage], **kwargs: Any
+    ) -> ChatResponseGen:
+        return self.llm.stream_chat(messages, **kwargs)
+
+    def stream_complete(
+        self, prompt: str, formatted: bool = False, **kwargs: Any
+    ) -> CompletionResponseGen:
+        return self.llm.stream_complete(prompt, formatted=formatted, **kwargs)
+
+    async def achat(
+        self, messages: Sequence[ChatMessage], **kwargs: Any
+    ) -> ChatResponse:
+        key = self._chat_key(messages, kwargs)
+        cached = self._cache.get(key)
+        if cached is not None:
+            return _chat_response(cached)
+        response = await self.llm.achat(messages, **kwargs)
+        self._cache.put(key, _chat_payload(response))
+        return response
+
+    async def acomplete(
+        self, prompt: str, formatted: bool = False, **kwargs: Any
+    ) -> CompletionResponse:
+        key = self._complete_key(prompt, formatted, kwargs)
+        cached = self._cache.get(key)
+        if cached is not None:
+            return CompletionResponse(text=cached["text"])
+        response = await self.llm.acomplete(prompt, formatted=formatted, **kwargs)
+        self._cache.put(key, {"text": response.text})
+        return response
+
+    async def astream_chat(
+        self, messages: Sequence[ChatMessage], **kwargs: Any
+    ) -> ChatResponseAsyncGen:
+        return await self.llm.astream_chat(messages, **kwargs)
+
+    async def astream_complete(
+        self, prompt: str, formatted: bool = False, **kwargs: Any
+    ) -> CompletionResponseAsyncGen:
+        return await self.llm.astream_complete(prompt, formatted=formatted, **kwargs)
+
+    def _chat_key(self, messages: Sequence[ChatMessage], kwargs: dict) -> str:
+        payload = [
+            {"role": _role(m.role), "content": str(m.content or "")} for m in messages
+        ]
+        return cache_key(self.model, self.temperature, "chat", payload, **kwargs)
+
+    def _complete_key(self, prompt: str, formatted: bool, kwargs: dict) -> str:
+        return cache_key(
+            self.model,
+            self.temperature,
+            "complete",
+            prompt,
+            formatted=formatted,
+            **kwargs,
+        )
+
+
+def _role(role: Any) -> str:
+    return getattr(role, "value", str(role))
+
+
+def _chat_payload(response: ChatResponse) -> dict:
+    return {
+        "role": _role(response.message.role),
+        "content": str(response.message.content or ""),
+    }
+
+
+def _chat_response(payload: dict) -> ChatResponse:
+    return ChatResponse(
+        message=ChatMessage(
+            role=MessageRole(payload["role"]), content=payload["content"]
+        )
+    )
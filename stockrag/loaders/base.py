@@ -1,5 +1,7 @@
 """Base loader utilities."""
 
+import re
+from html.parser import HTMLParser
 from typing import List, Dict, Any
 
 from llama_index.core import Document
@@ -19,3 +21,56 @@ def add_metadata(docs: List[Document], metadata: Dict[str, Any]) -> List[Documen
     for doc in docs:
         doc.metadata.update(metadata)
     return docs
+
+
+def normalize_whitespace(text: str) -> str:
+    """Collapse runs of spaces and blank lines left over from markup."""
+    text = re.sub(r"[ \t\r\f\v\xa0]+", " ", text)
+    text = re.sub(r" *\n *", "\n", text)
+    return re.sub(r"\n{3,}", "\n\n", text).strip()
+
+
+class HTMLTextExtractor(HTMLParser):
+    """Incremental HTML to text conversion that drops hidden XBRL headers."""
+
+    _SKIP = {"script", "style", "head", "ix:header"}
+    _BLOCK = {"p", "div", "br", "tr", "li", "table", "h1", "h2", "h3", "h4", "h5", "h6"}
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.parts: List[str] = []
+        self._skip_depth = 0
+
+    def handle_starttag(self, tag: str, attrs: Any) -> None:
+        if tag in self._SKIP:
+            self._skip_depth += 1
+        elif tag in self._BLOCK:
+            self.parts.append("\n")
+        elif tag == "td":
+            self.parts.append(" ")
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in self._SKIP:
+            self._skip_depth = max(0, self._skip_depth - 1)
+        elif tag in self._BLOCK:
+            self.parts.append("\n")
+
+    def handle_data(self, data: str) -> None:
+        if not self._skip_depth:
+            self.parts.append(data)
+
+
+def html_to_text(html: str) -> str:
+    """
+    Convert an HTML fragment or page to plain text.
+
+    Args:
+        html: HTML markup
+
+    Returns:
+        Text with block elements on separate lines
+    """
+    parser = HTMLTextExtractor()
+    parser.feed(html)
+    parser.close()
+    return normalize_whitespace("".join(parser.parts))
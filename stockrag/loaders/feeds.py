@@ -0,0 +1,253 @@
+"""Conditional HTTP fetching, RSS/Atom parsing and persistent feed state."""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import urllib.error
+import urllib.request
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = "stockrag/0.1"
+
+_ATOM = "{http://www.w3.org/2005/Atom}"
+_RSS1 = "{http://purl.org/rss/1.0/}"
+_CONTENT = "{http://purl.org/rss/1.0/modules/content/}"
+_DC = "{http://purl.org/dc/elements/1.1/}"
+
+
+@dataclass
+class FetchResult:
+    """Outcome of a conditional GET; body is empty when not modified."""
+
+    url: str
+    status: int
+    body: bytes = b""
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+    @property
+    def not_modified(self) -> bool:
+        return self.status == 304
+
+
+@dataclass
+class FeedItem:
+    """One entry of an RSS or Atom feed."""
+
+    guid: str
+    link: str
+    title: str = ""
+    published: str = ""
+    summary: str = ""
+
+    @property
+    def content_hash(self) -> str:
+        """Hash of the fields that change when a publisher edits an item."""
+        blob = "\x1f".join([self.link, self.title, self.published, self.summary])
+        return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def fetch_conditional(
+    url: str,
+    etag: Optional[str] = None,
+    last_modified: Optional[str] = None,
+    timeout: float = 30.0,
+) -> FetchResult:
+    """
+    GET a URL, sending validators from a previous response.
+
+    Args:
+        url: URL to fetch
+        etag: ETag of the copy already processed
+        last_modified: Last-Modified of the copy already processed
+        timeout: Socket timeout in seconds
+
+    Returns:
+        FetchResult with status 304 and no body if the server reports the
+        resource unchanged
+
+    Raises:
+        urllib.error.URLError: On network errors and non-304 HTTP errors
+    """
+    headers = {"User-Agent": USER_AGENT}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+
+    request = urllib.request.Request(url, headers=headers)
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return FetchResult(
+                url=url,
+                status=response.status,
+                body=response.read(),
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
+            )
+    except urllib.error.HTTPError as e:
+        if e.code != 304:
+            raise
+        # Servers may omit validators on 304; keep the ones we sent
+        return FetchResult(
+            url=url,
+            status=304,
+            etag=e.headers.get("ETag") or etag,
+            last_modified=e.headers.get("Last-Modified") or last_modified,
+        )
+
+
+def parse_feed(data: bytes) -> List[FeedItem]:
+    """
+    Parse an RSS 2.0, RSS 1.0 (RDF) or Atom document.
+
+    Args:
+        data: Raw feed bytes
+
+    Returns:
+        Feed items in document order
+
+    Raises:
+        ValueError: If the document is not a recognizable feed
+    """
+    try:
+        root = ET.fromstring(data)
+    except ET.ParseError as e:
+        raise ValueError(f"Malformed feed: {e}") from e
+
+    if root.tag == f"{_ATOM}feed":
+        return [_atom_item(entry) for entry in root.iter(f"{_ATOM}entry")]
+
+    if root.tag != "rss" and not root.tag.endswith("}RDF"):
+        raise ValueError(f"Unrecognized feed root element <{root.tag}>")
+    entries = list(root.iter("item")) or list(root.iter(f"{_RSS1}item"))
+    return [_rss_item(entry) for entry in entries]
+
+
+def _text(element: ET.Element, *tags: str) -> str:
+    for tag in tags:
+        child = element.find(tag)
+        if child is not None and child.text and child.text.strip():
+            return child.text.strip()
+    return ""
+
+
+def _rss_item(item: ET.Element) -> FeedItem:
+    link = _text(item, "link", f"{_RSS1}link")
+    title = _text(item, "title", f"{_RSS1}title")
+    guid = (
+        _text(item, "guid")
+        or item.get("{http://www.w3.org/1999/02/22-rdf-syntax-ns#}about", "")
+        or link
+        or title
+    )
+    return FeedItem(
+        guid=guid,
+        link=link,
+        title=title,
+        published=_text(item, "pubDate", f"{_DC}date"),
+        summary=_text(item, f"{_CONTENT}encoded", "description", f"{_RSS1}description"),
+    )
+
+
+def _atom_item(entry: ET.Element) -> FeedItem:
+    link = ""
+    for candidate in entry.findall(f"{_ATOM}link"):
+        if candidate.get("rel", "alternate") == "alternate":
+            link = candidate.get("href", "")
+            break
+    title = _text(entry, f"{_ATOM}title")
+    return FeedItem(
+        guid=_text(entry, f"{_ATOM}id") or link or title,
+        link=link,
+        title=title,
+        published=_text(entry, f"{_ATOM}updated", f"{_ATOM}published"),
+        summary=_text(entry, f"{_ATOM}content", f"{_ATOM}summary"),
+    )
+
+
+class FeedState:
+    """
+    Persistent record of what has already been fetched and indexed.
+
+    Per feed it keeps the HTTP validators (ETag/Last-Modified) and a
+    bounded map of item GUID -> content hash; per article URL it keeps the
+    validators and a hash of the extracted text. Stored as JSON and
+    replaced atomically on save.
+
+    Usage:
+        state = FeedState("./chroma_db_AAPL/news_state.json")
+        feed = state.feed("https://example.com/rss")
+        ...
+        state.save()
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        max_items_per_feed: int = 5000,
+        max_articles: int = 20000,
+    ):
+        self.path = path
+        self.max_items_per_feed = max_items_per_feed
+        self.max_articles = max_articles
+        self._lock = threading.Lock()
+        self._data: Dict[str, Dict[str, Any]] = {"feeds": {}, "articles": {}}
+        if path and os.path.exists(path):
+            try:
+                with open(path, encoding="utf-8") as f:
+                    loaded = json.load(f)
+                self._data["feeds"] = loaded.get("feeds", {})
+                self._data["articles"] = loaded.get("articles", {})
+            except (OSError, ValueError) as e:
+                logger.warning("Ignoring unreadable feed state %s: %s", path, e)
+
+    def feed(self, url: str) -> Dict[str, Any]:
+        """Mutable state of one feed: etag, last_modified and items."""
+        with self._lock:
+            return self._data["feeds"].setdefault(
+                url, {"etag": None, "last_modified": None, "items": {}}
+            )
+
+    def article(self, url: str) -> Dict[str, Any]:
+        """Mutable state of one article URL: etag, last_modified and hash."""
+        with self._lock:
+            return self._data["articles"].setdefault(
+                url, {"etag": None, "last_modified": None, "hash": None}
+            )
+
+    def mark_items(self, url: str, items: Dict[str, str]) -> None:
+        """Record item hashes for a feed, forgetting the oldest beyond the cap."""
+        seen = self.feed(url)["items"]
+        with self._lock:
+            for guid, content_hash in items.items():
+                # Re-insert so dict order tracks recency
+                seen.pop(guid, None)
+                seen[guid] = content_hash
+            for guid in list(seen)[: max(0, len(seen) - self.max_items_per_feed)]:
+                del seen[guid]
+
+    def save(self) -> None:
+        if not self.path:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with self._lock:
+            articles = self._data["articles"]
+            for url in list(articles)[: max(0, len(articles) - self.max_articles)]:
+                del articles[url]
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self._data, f)
+            os.replace(tmp_path, self.path)
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
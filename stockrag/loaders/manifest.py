@@ -0,0 +1,293 @@
+"""Persistent ingest manifest for skipping unchanged sources."""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+from llama_index.core import Document
+
+from stockrag.loaders.feeds import fetch_conditional, text_hash
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sources (
+    collection TEXT NOT NULL,
+    location TEXT NOT NULL,
+    source TEXT NOT NULL,
+    size INTEGER,
+    mtime_ns INTEGER,
+    etag TEXT,
+    last_modified TEXT,
+    content_hash TEXT NOT NULL,
+    chunk_ids TEXT NOT NULL,
+    ingested_at REAL NOT NULL,
+    PRIMARY KEY (collection, location)
+)
+"""
+
+
+class IngestManifest:
+    """
+    Record of every indexed source file or URL and the chunks it produced.
+
+    Loaders ask the manifest before parsing. Files whose size and mtime
+    match are skipped without being opened; files whose stat changed are
+    hashed and skipped if the content is the same. URLs are re-fetched with
+    a conditional GET and skipped on 304 or if their extracted text is the
+    same. Sources that do need parsing are staged and written to the
+    manifest by commit() once their chunks are in the vector store,
+    replacing the previous chunks.
+
+    One manifest file can serve every collection in a vector store; rows
+    are keyed by collection and location. File paths are resolved with
+    os.path.realpath, so the same file reached by different paths is one
+    source.
+
+    Usage:
+        manifest = IngestManifest(
+            "./chroma_db_AAPL/ingest_manifest.sqlite", "AAPL_knowledge_base"
+        )
+        state = manifest.check_file("./data/report.pdf")
+        if state is not None:
+            docs = parse(...)
+            manifest.stage("./data/report.pdf", "Annual Report", docs, state)
+        ...  # index docs
+        manifest.commit(ctx.chroma_collection)
+    """
+
+    def __init__(self, path: str, collection: str):
+        self.path = path
+        self.collection = collection
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._staged: Dict[str, Dict[str, Any]] = {}
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._migrate()
+            self._conn.execute(_SCHEMA)
+
+    def get(self, location: str) -> Optional[Dict[str, Any]]:
+        """Manifest entry of an indexed source, or None."""
+        location = _normalize(location)
+        with self._lock:
+            cur = self._conn.execute(
+                "SELECT * FROM sources WHERE collection = ? AND location = ?",
+                (self.collection, location),
+            )
+            row = cur.fetchone()
+            if row is None:
+                return None
+            entry = dict(zip([c[0] for c in cur.description], row))
+        entry["chunk_ids"] = json.loads(entry["chunk_ids"])
+        del entry["collection"]
+        return entry
+
+    def check_file(self, path: str, force: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Decide whether a local file needs parsing.
+
+        Args:
+            path: File path as passed to the loader
+            force: Always return a state (re-ingest unchanged files)
+
+        Returns:
+            None if the file is unchanged since it was indexed, else the
+            state to pass to stage()
+        """
+        stat = os.stat(path)
+        entry = self.get(path)
+        if not force and entry is not None:
+            if (entry["size"], entry["mtime_ns"]) == (stat.st_size, stat.st_mtime_ns):
+                return None
+
+        content_hash = _file_hash(path)
+        if not force and entry is not None and entry["content_hash"] == content_hash:
+            # Touched but not modified; remember the new stat for next time
+            self._update(path, size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+            return None
+        return {
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "content_hash": content_hash,
+        }
+
+    def check_url(
+        self,
+        url: str,
+        extract: Callable[[bytes], str],
+        force: bool = False,
+    ) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """
+        Fetch a URL once with a conditional GET and decide whether to index it.
+
+        The page is compared by a hash of its extracted text, so markup that
+        changes on every request (scripts, timestamps, tokens) does not
+        count as a change.
+
+        Args:
+            url: URL as passed to the loader
+            extract: Converts the fetched body to the text to index
+            force: Always return the page (re-ingest unchanged pages)
+
+        Returns:
+            None if the page is unchanged since it was indexed, else the
+            extracted text and the state to pass to stage()
+
+        Raises:
+            urllib.error.URLError: On fetch errors
+        """
+        entry = None if force else self.get(url)
+        result = fetch_conditional(
+            url,
+            entry["etag"] if entry else None,
+            entry["last_modified"] if entry else None,
+        )
+        if result.not_modified:
+            return None
+
+        text = extract(result.body)
+        content_hash = text_hash(text)
+        if entry is not None and entry["content_hash"] == content_hash:
+            self._update(url, etag=result.etag, last_modified=result.last_modified)
+            return None
+        return text, {
+            "size": len(result.body),
+            "etag": result.etag,
+            "last_modified": result.last_modified,
+            "content_hash": content_hash,
+        }
+
+    def stage(
+        self,
+        location: str,
+        source: str,
+        docs: List[Document],
+        state: Dict[str, Any],
+    ) -> None:
+        """Remember a parsed source until its chunks are indexed."""
+        with self._lock:
+            self._staged[_normalize(location)] = dict(
+                state, source=source, doc_ids=[doc.doc_id for doc in docs]
+            )
+
+    def commit(self, collection: Any) -> int:
+        """
+        Record staged sources whose documents are now in the collection.
+
+        Chunks a source produced in an earlier ingest are deleted, so a
+        changed file replaces its old chunks instead of duplicating them.
+
+        Args:
+            collection: Chroma collection the documents were indexed into
+
+        Returns:
+            Number of sources recorded
+        """
+        with self._lock:
+            staged = dict(self._staged)
+
+        committed = 0
+        for location, state in staged.items():
+            doc_ids = state["doc_ids"]
+            chunk_ids: List[str] = []
+            if doc_ids:
+                chunk_ids = collection.get(
+                    where={"ref_doc_id": {"$in": doc_ids}}, include=[]
+                )["ids"]
+                if not chunk_ids:
+                    # Not indexed (yet); keep it staged
+                    continue
+
+            previous = self.get(location)
+            if previous is not None:
+                stale = set(previous["chunk_ids"]) - set(chunk_ids)
+                if stale:
+                    collection.delete(ids=list(stale))
+                    logger.info(
+                        "Replaced %d chunks of changed source %s", len(stale), location
+                    )
+
+            with self._lock, self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO sources "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        self.collection,
+                        location,
+                        state["source"],
+                        state.get("size"),
+                        state.get("mtime_ns"),
+                        state.get("etag"),
+                        state.get("last_modified"),
+                        state["content_hash"],
+                        json.dumps(chunk_ids),
+                        time.time(),
+                    ),
+                )
+                self._staged.pop(location, None)
+            committed += 1
+
+        if committed:
+            logger.info("Ingest manifest: recorded %d sources", committed)
+        return committed
+
+    def forget(self, locations: Iterable[str]) -> int:
+        """Drop sources (e.g. after deleting their chunks) so they re-ingest."""
+        locations = [_normalize(location) for location in locations]
+        with self._lock, self._conn:
+            for location in locations:
+                self._staged.pop(location, None)
+            return self._conn.executemany(
+                "DELETE FROM sources WHERE collection = ? AND location = ?",
+                [(self.collection, location) for location in locations],
+            ).rowcount
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _update(self, location: str, **fields: Any) -> None:
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"UPDATE sources SET {assignments} "
+                "WHERE collection = ? AND location = ?",
+                (*fields.values(), self.collection, _normalize(location)),
+            )
+
+    def _migrate(self) -> None:
+        """Move rows of a manifest keyed by location alone to this collection."""
+        columns = [row[1] for row in self._conn.execute("PRAGMA table_info(sources)")]
+        if not columns or "collection" in columns:
+            return
+        logger.info("Upgrading ingest manifest %s for %s", self.path, self.collection)
+        rows = self._conn.execute("SELECT * FROM sources").fetchall()
+        self._conn.execute("DROP TABLE sources")
+        self._conn.execute(_SCHEMA)
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO sources VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [(self.collection, _normalize(row[0]), *row[1:]) for row in rows],
+        )
+
+
+def _normalize(location: str) -> str:
+    # URLs are kept as given; files are keyed by their resolved path
+    if "://" in location:
+        return location
+    return os.path.realpath(location)
+
+
+def _file_hash(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
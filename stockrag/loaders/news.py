@@ -1,69 +1,191 @@
 """News and RSS feed loader."""
 
 import logging
+import os
+import urllib.error
 from datetime import datetime
 from typing import List, Optional
 
 logger = logging.getLogger(__name__)
 
 from llama_index.core import Document
-from llama_index.readers.web import TrafilaturaWebReader
 
 from stockrag.core.context import RAGContext
-from stockrag.loaders.base import add_metadata
+from stockrag.loaders.base import add_metadata, html_to_text
+from stockrag.loaders.feeds import (
+    FeedItem,
+    FeedState,
+    fetch_conditional,
+    parse_feed,
+    text_hash,
+)
+from stockrag.profiling import profiled
 
 
+def news_state_path(ctx: RAGContext) -> Optional[str]:
+    """Location of the persistent feed state, next to the vector store."""
+    if ctx.persist_path is None:
+        return None
+    return os.path.join(ctx.persist_path, "news_state.json")
+
+
+@profiled
 def load_news_releases(
     ctx: RAGContext,
     rss_url: Optional[str] = None,
     news_urls: Optional[List[str]] = None,
     add_to_context: bool = True,
+    state: Optional[FeedState] = None,
 ) -> List[Document]:
     """
     Load news releases from RSS feeds or direct URLs.
 
+    By default every feed item and article is returned. Given a feed
+    state, feeds and articles are fetched with conditional GETs and only
+    those new or changed since the state was saved are returned; the
+    state is updated in memory and the caller saves it once the documents
+    are indexed (see refresh_news).
+
     Args:
         ctx: RAGContext instance
-        rss_url: Optional RSS feed URL
+        rss_url: Optional RSS or Atom feed URL
         news_urls: Optional list of news article URLs
         add_to_context: Whether to add docs to ctx.documents
+        state: Feed state for incremental loading
 
     Returns:
         List of loaded Document objects
     """
     logger.info("Loading news releases...")
 
+    if state is None:
+        state = FeedState()
+
     news_docs = []
 
-    # Option 1: RSS feed
+    # Option 1: RSS/Atom feed
     if rss_url:
-        # TODO: Implement RSS feed support using llama_index.readers.rss.RssReader
-        logger.warning("RSS feed loading is not yet implemented. Provide news_urls instead.")
+        news_docs.extend(_load_feed(ctx, rss_url, state))
 
     # Option 2: Direct URLs
     if news_urls:
-        web_reader = TrafilaturaWebReader()
         for url in news_urls:
             try:
-                docs = web_reader.load_data(urls=[url])
-
-                # Add metadata
-                add_metadata(
-                    docs,
-                    {
-                        "source": "News Release",
-                        "ticker": ctx.ticker,
-                        "url": url,
-                        "scrape_date": datetime.now().isoformat(),
-                    },
-                )
-
-                news_docs.extend(docs)
+                text = _fetch_article(url, state)
             except Exception as e:
                 logger.error("Error loading news from %s: %s", url, e)
+                continue
+            if text is not None:
+                news_docs.append(_news_document(ctx, url, text))
 
     if add_to_context:
         ctx.documents.extend(news_docs)
 
     logger.info("Loaded %d news documents", len(news_docs))
     return news_docs
+
+
+def _load_feed(ctx: RAGContext, rss_url: str, state: FeedState) -> List[Document]:
+    """Documents for the new or changed items of one feed."""
+    feed_state = state.feed(rss_url)
+    try:
+        result = fetch_conditional(
+            rss_url, feed_state["etag"], feed_state["last_modified"]
+        )
+    except (urllib.error.URLError, OSError) as e:
+        logger.error("Error fetching feed %s: %s", rss_url, e)
+        return []
+    if result.not_modified:
+        logger.info("Feed %s not modified since last poll", rss_url)
+        return []
+
+    try:
+        items = parse_feed(result.body)
+    except ValueError as e:
+        logger.error("Error parsing feed %s: %s", rss_url, e)
+        return []
+
+    docs = []
+    handled = {}
+    for item in items:
+        content_hash = item.content_hash
+        if feed_state["items"].get(item.guid) == content_hash:
+            handled[item.guid] = content_hash
+            continue
+
+        text = None
+        if item.link:
+            try:
+                text = _fetch_article(item.link, state)
+            except Exception as e:
+                logger.warning("Error loading %s, using feed summary: %s", item.link, e)
+                text = html_to_text(item.summary) or None
+                if text is None:
+                    # Leave unmarked so the next poll retries it
+                    continue
+        elif item.summary:
+            text = html_to_text(item.summary)
+
+        handled[item.guid] = content_hash
+        if text:
+            docs.append(
+                _news_document(ctx, item.link or item.guid, text, item, rss_url)
+            )
+
+    state.mark_items(rss_url, handled)
+    feed_state["etag"] = result.etag
+    feed_state["last_modified"] = result.last_modified
+
+    logger.info("Feed %s: %d items, %d new or changed", rss_url, len(items), len(docs))
+    return docs
+
+
+def _fetch_article(url: str, state: FeedState) -> Optional[str]:
+    """
+    Fetch and extract an article, or return None if it is unchanged.
+
+    Raises:
+        ValueError: If no article text could be extracted
+        urllib.error.URLError: On fetch errors
+    """
+    import trafilatura
+
+    article = state.article(url)
+    result = fetch_conditional(url, article["etag"], article["last_modified"])
+    if result.not_modified:
+        return None
+
+    text = trafilatura.extract(result.body, url=url)
+    if not text:
+        raise ValueError("no article text extracted")
+
+    content_hash = text_hash(text)
+    unchanged = article["hash"] == content_hash
+    article.update(
+        etag=result.etag, last_modified=result.last_modified, hash=content_hash
+    )
+    return None if unchanged else text
+
+
+def _news_document(
+    ctx: RAGContext,
+    url: str,
+    text: str,
+    item: Optional[FeedItem] = None,
+    feed_url: Optional[str] = None,
+) -> Document:
+    doc = Document(text=text, id_=url)
+    add_metadata(
+        [doc],
+        {
+            "source": "News Release",
+            "ticker": ctx.ticker,
+            "url": url,
+            "scrape_date": datetime.now().isoformat(),
+        },
+    )
+    if item is not None:
+        doc.metadata.update(
+            {"title": item.title, "published": item.published, "feed_url": feed_url}
+        )
+    return doc
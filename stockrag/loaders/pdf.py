@@ -10,20 +10,27 @@ from llama_index.readers.file import PDFReader
 
 from stockrag.core.context import RAGContext
 from stockrag.loaders.base import add_metadata
+from stockrag.profiling import profiled
 
 
+@profiled
 def load_annual_reports(
     ctx: RAGContext,
     pdf_paths: List[str],
     add_to_context: bool = True,
+    force: bool = False,
 ) -> List[Document]:
     """
     Load annual reports from PDF files.
 
+    Files recorded in the ingest manifest as indexed and unchanged are
+    skipped without being parsed.
+
     Args:
         ctx: RAGContext instance
         pdf_paths: List of paths to PDF files
         add_to_context: Whether to add docs to ctx.documents
+        force: Parse every file, even if unchanged
 
     Returns:
         List of loaded Document objects
@@ -31,8 +38,17 @@ def load_annual_reports(
     logger.info("Loading annual reports...")
     pdf_reader = PDFReader()
 
+    manifest = ctx.ingest_manifest
     annual_docs = []
+    skipped = 0
     for pdf_path in pdf_paths:
+        state = None
+        if manifest is not None:
+            state = manifest.check_file(pdf_path, force=force)
+            if state is None:
+                skipped += 1
+                continue
+
         docs = pdf_reader.load_data(file=pdf_path)
 
         # Add metadata
@@ -45,10 +61,17 @@ def load_annual_reports(
             },
         )
 
+        if manifest is not None:
+            manifest.stage(pdf_path, "Annual Report", docs, state)
+
         annual_docs.extend(docs)
 
     if add_to_context:
         ctx.documents.extend(annual_docs)
 
-    logger.info("Loaded %d annual report documents", len(annual_docs))
+    logger.info(
+        "Loaded %d annual report documents (%d unchanged files skipped)",
+        len(annual_docs),
+        skipped,
+    )
     return annual_docs
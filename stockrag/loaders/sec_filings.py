@@ -1,38 +1,390 @@
-"""SEC EDGAR filings loader."""
+"""SEC EDGAR filings loader (local bulk mirror)."""
 
-from typing import List, Optional
+import json
+import logging
+import os
+import re
+import tarfile
+import zipfile
+from typing import IO, Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
 
 from llama_index.core import Document
 
 from stockrag.core.context import RAGContext
+from stockrag.core.exceptions import ConfigurationError
+from stockrag.loaders.base import HTMLTextExtractor, add_metadata, normalize_whitespace
+from stockrag.profiling import profiled
+
+EDGAR_PATH_ENV = "EDGAR_MIRROR_PATH"
+
+_FILING_SUFFIXES = (".txt", ".nc")
+_ACCESSION_RE = re.compile(r"(\d{10})-?(\d{2})-?(\d{6})")
+_DATE_FIELDS = {"filing_date", "period_of_report"}
+
+# Header fields from both the full-submission (.txt) and dissemination (.nc) formats
+_HEADER_KEYS = {
+    "ACCESSION NUMBER": "accession_number",
+    "ACCESSION-NUMBER": "accession_number",
+    "CONFORMED SUBMISSION TYPE": "form_type",
+    "TYPE": "form_type",
+    "CONFORMED PERIOD OF REPORT": "period_of_report",
+    "PERIOD": "period_of_report",
+    "FILED AS OF DATE": "filing_date",
+    "FILING-DATE": "filing_date",
+    "CENTRAL INDEX KEY": "cik",
+    "CIK": "cik",
+    "COMPANY CONFORMED NAME": "company_name",
+    "CONFORMED-NAME": "company_name",
+}
 
 
+@profiled
 def load_sec_filings(
     ctx: RAGContext,
     filing_types: Optional[List[str]] = None,
     add_to_context: bool = True,
+    edgar_path: Optional[str] = None,
+    cik: Optional[str] = None,
+    date_range: Optional[Tuple[str, str]] = None,
 ) -> List[Document]:
     """
-    Load SEC filings from EDGAR database.
+    Load SEC filings from a local EDGAR bulk mirror.
+
+    The mirror may be a directory tree (e.g. ``edgar/data/{cik}/...``), a
+    zip or a tar archive of full submission files (``.txt`` or ``.nc``).
+    Filings are filtered by form type and filing date before any body is
+    parsed, using the mirror's ``CIK##########.json`` submissions index when
+    present and the SGML header otherwise. Only the primary document of
+    each filing is stream-parsed; exhibits and XBRL attachments are skipped.
+    A tar archive is read in a single streaming pass, so its
+    ``company_tickers.json`` and submissions index files must sit next to
+    the archive rather than inside it.
 
     Args:
         ctx: RAGContext instance
-        filing_types: List of filing types (e.g., ["10-K", "10-Q", "8-K"])
+        filing_types: List of filing types (e.g., ["10-K", "10-Q", "8-K"]);
+            all types if None
         add_to_context: Whether to add docs to ctx.documents
+        edgar_path: Mirror directory or archive (defaults to $EDGAR_MIRROR_PATH)
+        cik: Company CIK (resolved from the mirror's company_tickers.json if None)
+        date_range: Optional filing date range (start, end) as ISO dates, inclusive
 
     Returns:
         List of loaded Document objects
 
-    Note:
-        This is currently a placeholder implementation.
-        TODO: Implement actual SEC filing loading from EDGAR.
-        Options:
-        - Use SECFilingsLoader (if available)
-        - Manual download from:
-          https://www.sec.gov/cgi-bin/browse-edgar?action=getcompany&CIK={ticker}
-        - Then use UnstructuredReader or PDFReader
+    Raises:
+        ConfigurationError: If the mirror path or CIK cannot be resolved
     """
-    raise NotImplementedError(
-        "SEC EDGAR filing loader is not yet implemented. "
-        "Contributions welcome! See docstring for implementation options."
+    edgar_path = edgar_path or os.environ.get(EDGAR_PATH_ENV)
+    if not edgar_path or not os.path.exists(edgar_path):
+        raise ConfigurationError(
+            f"EDGAR mirror not found. Pass edgar_path or set {EDGAR_PATH_ENV}."
+        )
+
+    logger.info("Loading SEC filings from %s...", edgar_path)
+    forms = {f.upper() for f in filing_types} if filing_types else None
+
+    sec_docs = []
+    with _Mirror(edgar_path) as mirror:
+        cik = _normalize_cik(cik) if cik else _resolve_cik(mirror, ctx.ticker)
+        index = _load_submissions_index(mirror, cik)
+
+        for name, opener in mirror.members(cik):
+            accession = _accession_from_name(name)
+            entry = index.get(accession) if accession else None
+            if entry is not None and not _matches(entry, forms, date_range):
+                continue
+
+            with opener() as raw:
+                lines = _text_lines(raw)
+                header, lines = _read_header(lines)
+                if not header:
+                    continue  # Not an EDGAR submission file
+                if header.get("cik") and _normalize_cik(header["cik"]) != cik:
+                    continue
+                header = {**header, **(entry or {})}
+                if not _matches(header, forms, date_range):
+                    continue
+                text = _extract_primary_document(lines)
+
+            if not text:
+                continue
+
+            doc = Document(text=text)
+            add_metadata(
+                [doc],
+                {
+                    "source": "SEC Filing",
+                    "ticker": ctx.ticker,
+                    "cik": cik,
+                    "form_type": header.get("form_type", ""),
+                    "filing_date": header.get("filing_date", ""),
+                    "period_of_report": header.get("period_of_report", ""),
+                    "accession_number": header.get("accession_number", accession or ""),
+                    "file_path": os.path.join(edgar_path, name),
+                },
+            )
+            sec_docs.append(doc)
+
+    if add_to_context:
+        ctx.documents.extend(sec_docs)
+
+    logger.info("Loaded %d SEC filing documents", len(sec_docs))
+    return sec_docs
+
+
+class _Mirror:
+    """Uniform read access to a directory, zip or tar EDGAR mirror."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._zip: Optional[zipfile.ZipFile] = None
+        self._tar: Optional[tarfile.TarFile] = None
+        if os.path.isdir(path):
+            pass
+        elif zipfile.is_zipfile(path):
+            self._zip = zipfile.ZipFile(path)
+        elif tarfile.is_tarfile(path):
+            # Stream mode: one sequential pass, no random access needed
+            self._tar = tarfile.open(path, "r|*")
+        else:
+            raise ConfigurationError(f"Unsupported EDGAR mirror format: {path}")
+
+    def __enter__(self) -> "_Mirror":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        if self._zip is not None:
+            self._zip.close()
+        if self._tar is not None:
+            self._tar.close()
+
+    def find(self, basename: str) -> Optional[bytes]:
+        """Read a small index file by basename."""
+        if self._tar is not None:
+            return self._find_in_tar(basename)
+        if self._zip is not None:
+            for name in self._zip.namelist():
+                if os.path.basename(name) == basename:
+                    return self._zip.read(name)
+            return None
+        base_depth = self.path.rstrip(os.sep).count(os.sep)
+        for root, dirs, files in os.walk(self.path):
+            if basename in files:
+                with open(os.path.join(root, basename), "rb") as f:
+                    return f.read()
+            # Index files live near the top; don't walk the filing tree
+            if root.count(os.sep) - base_depth >= 1:
+                dirs[:] = []
+            else:
+                dirs[:] = [d for d in dirs if d not in ("edgar", "data")]
+        return None
+
+    def _find_in_tar(self, basename: str) -> Optional[bytes]:
+        # Scanning the archive for index files would decompress it a second
+        # time, so they are read from next to the archive instead
+        path = os.path.join(os.path.dirname(os.path.abspath(self.path)), basename)
+        if not os.path.isfile(path):
+            return None
+        with open(path, "rb") as f:
+            return f.read()
+
+    def members(self, cik: str) -> Iterator[Tuple[str, Callable[[], IO[bytes]]]]:
+        """Yield (name, opener) for candidate filing files of one company."""
+        if self._zip is not None:
+            for name in self._zip.namelist():
+                if _is_candidate(name, cik):
+                    yield name, (lambda n=name: self._zip.open(n))
+        elif self._tar is not None:
+            for member in self._tar:
+                if member.isfile() and _is_candidate(member.name, cik):
+                    yield member.name, (lambda m=member: self._tar.extractfile(m))
+        else:
+            for root in _company_roots(self.path, cik):
+                for dirpath, _, files in os.walk(root):
+                    for filename in sorted(files):
+                        full = os.path.join(dirpath, filename)
+                        name = os.path.relpath(full, self.path)
+                        if _is_candidate(name, cik):
+                            yield name, (lambda p=full: open(p, "rb"))
+
+
+def _company_roots(path: str, cik: str) -> List[str]:
+    """Restrict a directory walk to the company's folder when the layout allows."""
+    cik_dir = str(int(cik))
+    for candidate in (
+        os.path.join(path, "edgar", "data", cik_dir),
+        os.path.join(path, "data", cik_dir),
+        os.path.join(path, cik_dir),
+    ):
+        if os.path.isdir(candidate):
+            return [candidate]
+    return [path]
+
+
+def _is_candidate(name: str, cik: str) -> bool:
+    """Cheap path-only check: filing suffix and, if present, the CIK folder."""
+    if not name.lower().endswith(_FILING_SUFFIXES):
+        return False
+    parts = name.replace("\\", "/").split("/")
+    if "data" in parts:
+        i = parts.index("data")
+        if i + 1 < len(parts) - 1 and parts[i + 1].isdigit():
+            return int(parts[i + 1]) == int(cik)
+    return True
+
+
+def _normalize_cik(cik: Any) -> str:
+    return f"{int(str(cik).strip()):010d}"
+
+
+def _resolve_cik(mirror: _Mirror, ticker: str) -> str:
+    raw = mirror.find("company_tickers.json")
+    if raw:
+        for entry in json.loads(raw).values():
+            if str(entry.get("ticker", "")).upper() == ticker.upper():
+                return _normalize_cik(entry["cik_str"])
+    raise ConfigurationError(
+        f"Could not resolve CIK for {ticker}. Pass cik= or add company_tickers.json "
+        "to the EDGAR mirror (next to it for tar archives)."
     )
+
+
+def _load_submissions_index(mirror: _Mirror, cik: str) -> Dict[str, Dict[str, str]]:
+    """Map accession number -> header-like fields from the bulk submissions JSON."""
+    raw = mirror.find(f"CIK{cik}.json")
+    if not raw:
+        return {}
+
+    data = json.loads(raw)
+    pages = [data.get("filings", {}).get("recent", {})]
+    for extra in data.get("filings", {}).get("files", []):
+        extra_raw = mirror.find(extra.get("name", ""))
+        if extra_raw:
+            pages.append(json.loads(extra_raw))
+
+    index = {}
+    for page in pages:
+        for accession, form, filed, period in zip(
+            page.get("accessionNumber", []),
+            page.get("form", []),
+            page.get("filingDate", []),
+            page.get("reportDate", []),
+        ):
+            index[accession] = {
+                "accession_number": accession,
+                "form_type": form,
+                "filing_date": filed,
+                "period_of_report": period,
+            }
+    return index
+
+
+def _accession_from_name(name: str) -> Optional[str]:
+    match = _ACCESSION_RE.search(os.path.basename(name)) or _ACCESSION_RE.search(name)
+    if not match:
+        return None
+    return "-".join(match.groups())
+
+
+def _matches(
+    fields: Dict[str, str],
+    forms: Optional[set],
+    date_range: Optional[Tuple[str, str]],
+) -> bool:
+    if forms is not None and fields.get("form_type", "").upper() not in forms:
+        return False
+    if date_range:
+        filed = fields.get("filing_date", "")
+        start, end = date_range
+        if not filed or (start and filed < start) or (end and filed > end):
+            return False
+    return True
+
+
+def _text_lines(raw: IO[bytes]) -> Iterator[str]:
+    # Decode per line: tar stream members are not seekable, which TextIOWrapper needs
+    for line in raw:
+        yield line.decode("utf-8", errors="replace")
+
+
+def _iso_date(value: str) -> str:
+    value = value.strip()
+    if len(value) == 8 and value.isdigit():
+        return f"{value[:4]}-{value[4:6]}-{value[6:]}"
+    return value
+
+
+def _read_header(lines: Iterator[str]) -> Tuple[Dict[str, str], Iterator[str]]:
+    """
+    Parse the SGML header, consuming lines up to the first document.
+
+    Returns:
+        (header fields, iterator positioned at the first <DOCUMENT>)
+    """
+    header: Dict[str, str] = {}
+    for line in lines:
+        stripped = line.strip()
+        if stripped == "</SEC-HEADER>":
+            break
+        if stripped == "<DOCUMENT>":
+            return header, _prepend(line, lines)
+
+        tag = re.match(r"<([A-Z-]+)>(.+)", stripped)
+        if tag:
+            key, value = tag.groups()
+        else:
+            key, _, value = stripped.partition(":")
+        field = _HEADER_KEYS.get(key.strip())
+        if field and value.strip() and field not in header:
+            value = value.strip()
+            header[field] = _iso_date(value) if field in _DATE_FIELDS else value
+    return header, lines
+
+
+def _prepend(line: str, lines: Iterator[str]) -> Iterator[str]:
+    yield line
+    yield from lines
+
+
+def _extract_primary_document(lines: Iterator[str]) -> str:
+    """
+    Stream the primary document's <TEXT> body to plain text.
+
+    The primary document is always the first <DOCUMENT> of a submission;
+    reading stops at its </TEXT> so exhibits and XBRL are never parsed.
+    """
+    filename = ""
+    for line in lines:
+        stripped = line.strip()
+        if stripped.startswith("<FILENAME>"):
+            filename = stripped[10:].strip().lower()
+        elif stripped == "<TEXT>":
+            return _stream_text(lines, filename)
+    return ""
+
+
+def _stream_text(lines: Iterator[str], filename: str) -> str:
+    parser: Optional[HTMLTextExtractor] = None
+    parts: List[str] = []
+    for line in lines:
+        if line.strip() == "</TEXT>":
+            break
+        if parser is None and not parts:
+            if not line.strip():
+                continue
+            head = line.lstrip().lower()
+            if filename.endswith((".htm", ".html")) or head.startswith(
+                ("<html", "<?xml", "<!doctype")
+            ):
+                parser = HTMLTextExtractor()
+        if parser is not None:
+            parser.feed(line)
+        else:
+            parts.append(line)
+    if parser is not None:
+        parser.close()
+        parts = parser.parts
+    return normalize_whitespace("".join(parts))
@@ -6,36 +6,56 @@ from typing import List
 
 logger = logging.getLogger(__name__)
 
+from bs4 import BeautifulSoup
 from llama_index.core import Document
-from llama_index.readers.web import BeautifulSoupWebReader
 
 from stockrag.core.context import RAGContext
 from stockrag.loaders.base import add_metadata
+from stockrag.loaders.feeds import fetch_conditional
+from stockrag.profiling import profiled
 
 
+@profiled
 def load_company_website(
     ctx: RAGContext,
     urls: List[str],
     add_to_context: bool = True,
+    force: bool = False,
 ) -> List[Document]:
     """
     Load content from company website URLs.
 
+    Each page is downloaded once. Pages recorded in the ingest manifest
+    as indexed are fetched with a conditional GET and skipped if the
+    server reports them unchanged or their text is the same.
+
     Args:
         ctx: RAGContext instance
         urls: List of website URLs to scrape
         add_to_context: Whether to add docs to ctx.documents
+        force: Scrape every URL, even if unchanged
 
     Returns:
         List of loaded Document objects
     """
     logger.info("Loading company website content...")
-    web_reader = BeautifulSoupWebReader()
 
+    manifest = ctx.ingest_manifest
     web_docs = []
+    skipped = 0
     for url in urls:
         try:
-            docs = web_reader.load_data(urls=[url])
+            state = None
+            if manifest is not None:
+                checked = manifest.check_url(url, _page_text, force=force)
+                if checked is None:
+                    skipped += 1
+                    continue
+                text, state = checked
+            else:
+                text = _page_text(fetch_conditional(url).body)
+
+            docs = [Document(text=text, metadata={"URL": url})]
 
             # Add metadata
             add_metadata(
@@ -48,6 +68,9 @@ def load_company_website(
                 },
             )
 
+            if manifest is not None:
+                manifest.stage(url, "Company Website", docs, state)
+
             web_docs.extend(docs)
         except Exception as e:
             logger.error("Error loading %s: %s", url, e)
@@ -55,5 +78,14 @@ def load_company_website(
     if add_to_context:
         ctx.documents.extend(web_docs)
 
-    logger.info("Loaded %d website documents", len(web_docs))
+    logger.info(
+        "Loaded %d website documents (%d unchanged pages skipped)",
+        len(web_docs),
+        skipped,
+    )
     return web_docs
+
+
+def _page_text(body: bytes) -> str:
+    """Page text as BeautifulSoupWebReader extracts it."""
+    return BeautifulSoup(body, "html.parser").getText()
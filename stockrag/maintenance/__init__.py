@@ -1,9 +1,16 @@
 """Maintenance operations for the RAG system."""
 
-from stockrag.maintenance.update import update_with_new_data
-from stockrag.maintenance.stats import get_stats
+from stockrag.maintenance.update import refresh_news, update_with_new_data
+from stockrag.maintenance.stats import benchmark_document_retention, get_stats
+from stockrag.maintenance.delete import delete_documents
+from stockrag.maintenance.compact import compact_index, recover_compaction
 
 __all__ = [
     "update_with_new_data",
+    "refresh_news",
     "get_stats",
+    "benchmark_document_retention",
+    "delete_documents",
+    "compact_index",
+    "recover_compaction",
 ]
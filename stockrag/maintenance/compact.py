@@ -0,0 +1,238 @@
+"""Vector store compaction."""
+
+import json
+import logging
+import os
+import sqlite3
+import struct
+from typing import Any, Dict
+
+logger = logging.getLogger(__name__)
+
+from stockrag.core.context import RAGContext
+from stockrag.core.exceptions import IndexNotBuiltError
+from stockrag.index.persistence import rebind_collection
+
+# chroma-hnswlib header.bin: persistence version (int32), then offset_level0,
+# max_elements and cur_element_count (uint64); deleted elements still count
+_HNSW_HEADER = struct.Struct("<iQQQ")
+
+
+def compact_index(ctx: RAGContext, batch_size: int = 1000) -> Dict[str, Any]:
+    """
+    Rebuild the collection's ANN index and reclaim SQLite space.
+
+    Chroma only marks deleted vectors in its HNSW index, so after deletes
+    the index keeps its size. Compaction copies live records into a
+    temporary collection, recreates the original from it (a fresh HNSW
+    graph with no tombstones), drops the copy and VACUUMs the database.
+    If a previous compaction was interrupted, it is finished first (see
+    recover_compaction).
+
+    Args:
+        ctx: RAGContext with vector store configured
+        batch_size: Records copied per call
+
+    Returns:
+        Report with vectors_before and vectors_after (vectors stored in the
+        ANN index, including deleted ones), vectors_reclaimed, bytes_before,
+        bytes_after and bytes_reclaimed
+
+    Raises:
+        IndexNotBuiltError: If the vector store is not configured
+    """
+    if ctx.chroma_collection is None:
+        raise IndexNotBuiltError()
+
+    client = ctx.chroma_client
+    persist_path = client.get_settings().persist_directory
+    name = ctx.chroma_collection.name
+    if recover_compaction(client, name):
+        rebind_collection(ctx, client.get_collection(name))
+
+    old = ctx.chroma_collection
+    metadata = old.metadata or None
+    bytes_before = _dir_size(persist_path)
+    vectors_before = _stored_vectors(persist_path, old)
+
+    logger.info("Compacting collection %s...", name)
+
+    # Copy first so a crash part-way never loses the only copy; the marker
+    # tells recover_compaction the copy is complete
+    temp_name = _temp_name(name)
+    _drop_if_exists(client, temp_name)
+    temp = client.create_collection(name=temp_name, metadata=metadata)
+    live = _copy(old, temp, batch_size)
+    _write_marker(persist_path, name, live)
+
+    client.delete_collection(name)
+    fresh = client.create_collection(name=name, metadata=metadata)
+    _copy(temp, fresh, batch_size)
+    client.delete_collection(temp_name)
+    os.remove(_marker_path(persist_path, name))
+
+    _vacuum(persist_path)
+    rebind_collection(ctx, fresh)
+
+    bytes_after = _dir_size(persist_path)
+    vectors_after = _stored_vectors(persist_path, fresh)
+    report = {
+        "collection": name,
+        "vectors_before": vectors_before,
+        "vectors_after": vectors_after,
+        "vectors_reclaimed": vectors_before - vectors_after,
+        "bytes_before": bytes_before,
+        "bytes_after": bytes_after,
+        "bytes_reclaimed": bytes_before - bytes_after,
+    }
+    logger.info(
+        "Compaction done: %d vectors reclaimed, %d bytes reclaimed",
+        report["vectors_reclaimed"],
+        report["bytes_reclaimed"],
+    )
+    return report
+
+
+def recover_compaction(client: Any, name: str) -> bool:
+    """
+    Finish a compaction of collection name that was interrupted by a crash.
+
+    If the copy into the temporary collection had completed, the original
+    may already be deleted or only partly rebuilt, so it is restored from
+    the copy. An incomplete copy is dropped; the original is then intact.
+
+    Args:
+        client: Chroma client
+        name: Name of the compacted collection
+
+    Returns:
+        True if the collection was restored from the temporary copy
+    """
+    persist_path = client.get_settings().persist_directory
+    marker = _marker_path(persist_path, name)
+    temp = _get_if_exists(client, _temp_name(name))
+    if not os.path.exists(marker):
+        if temp is not None:
+            client.delete_collection(temp.name)
+        return False
+    if temp is None:
+        # Crashed after the copy was dropped; compaction had finished
+        os.remove(marker)
+        return False
+
+    with open(marker, encoding="utf-8") as f:
+        expected = json.load(f)["count"]
+    current = _get_if_exists(client, name)
+    restored = current is None or current.count() != expected
+    if restored:
+        logger.warning(
+            "Restoring collection %s from interrupted compaction (%d vectors)",
+            name,
+            expected,
+        )
+        _drop_if_exists(client, name)
+        fresh = client.create_collection(name=name, metadata=temp.metadata or None)
+        _copy(temp, fresh, 1000)
+    client.delete_collection(temp.name)
+    os.remove(marker)
+    return restored
+
+
+def _copy(source: Any, target: Any, batch_size: int) -> int:
+    copied = 0
+    while True:
+        page = source.get(
+            limit=batch_size,
+            offset=copied,
+            include=["embeddings", "documents", "metadatas"],
+        )
+        if not page["ids"]:
+            return copied
+        target.add(
+            ids=page["ids"],
+            embeddings=page["embeddings"],
+            documents=page["documents"],
+            metadatas=page["metadatas"],
+        )
+        copied += len(page["ids"])
+
+
+def _temp_name(name: str) -> str:
+    return f"{name}__compact"
+
+
+def _marker_path(persist_path: str, name: str) -> str:
+    return os.path.join(persist_path, f"{_temp_name(name)}.json")
+
+
+def _write_marker(persist_path: str, name: str, count: int) -> None:
+    path = _marker_path(persist_path, name)
+    with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+        json.dump({"count": count}, f)
+    os.replace(f"{path}.tmp", path)
+
+
+def _get_if_exists(client: Any, name: str) -> Any:
+    try:
+        return client.get_collection(name)
+    except Exception:
+        return None
+
+
+def _stored_vectors(persist_path: str, collection: Any) -> int:
+    """Vectors in the collection's HNSW index, including deleted ones."""
+    db_path = os.path.join(persist_path, "chroma.sqlite3")
+    segments = []
+    try:
+        conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+        try:
+            segments = conn.execute(
+                "SELECT id FROM segments WHERE collection = ? AND scope = 'VECTOR'",
+                (str(collection.id),),
+            ).fetchall()
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        pass
+
+    for (segment_id,) in segments:
+        header = os.path.join(persist_path, segment_id, "header.bin")
+        if os.path.exists(header):
+            with open(header, "rb") as f:
+                data = f.read(_HNSW_HEADER.size)
+            if len(data) == _HNSW_HEADER.size:
+                version, _, max_elements, count = _HNSW_HEADER.unpack(data)
+                if version == 1 and count <= max_elements:
+                    return count
+            logger.warning("Unrecognized HNSW header %s; using live count", header)
+    # Index not flushed to disk yet; every vector is still live
+    return collection.count()
+
+
+def _drop_if_exists(client: Any, name: str) -> None:
+    try:
+        client.delete_collection(name)
+    except Exception:
+        pass
+
+
+def _vacuum(persist_path: str) -> None:
+    db_path = os.path.join(persist_path, "chroma.sqlite3")
+    if not os.path.exists(db_path):
+        return
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.execute("VACUUM")
+    finally:
+        conn.close()
+
+
+def _dir_size(path: str) -> int:
+    total = 0
+    for root, _, files in os.walk(path):
+        for filename in files:
+            try:
+                total += os.path.getsize(os.path.join(root, filename))
+            except OSError:
+                pass
+    return total
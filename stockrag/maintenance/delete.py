@@ -0,0 +1,152 @@
+"""Deletion of indexed chunks."""
+
+import logging
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+from stockrag.core.context import RAGContext
+from stockrag.core.exceptions import IndexNotBuiltError
+from stockrag.index.hierarchy import (
+    document_key,
+    get_summary_collection,
+    update_summary_index,
+)
+
+# Metadata fields recording when a document was fetched or filed
+DATE_FIELDS = ("scrape_date", "filing_date")
+
+
+def delete_documents(
+    ctx: RAGContext,
+    doc_ids: Optional[List[str]] = None,
+    source: Optional[str] = None,
+    url: Optional[str] = None,
+    file_path: Optional[str] = None,
+    older_than: Optional[str] = None,
+    batch_size: int = 500,
+) -> int:
+    """
+    Delete chunks from the vector store in batched calls.
+
+    Filters are combined with AND; at least one must be given.
+
+    Args:
+        ctx: RAGContext with vector store configured
+        doc_ids: Delete chunks of these source document ids
+        source: Delete chunks with this source type (e.g., "News Release")
+        url: Delete chunks scraped from this URL
+        file_path: Delete chunks loaded from this file
+        older_than: ISO date; delete chunks whose scrape_date or filing_date
+            is earlier (chunks without a date are kept)
+        batch_size: Number of ids fetched and deleted per call
+
+    Returns:
+        Number of chunks deleted
+
+    Raises:
+        IndexNotBuiltError: If the vector store is not configured
+        ValueError: If no filter is given
+    """
+    if ctx.chroma_collection is None:
+        raise IndexNotBuiltError()
+
+    where = _build_where(doc_ids, source, url, file_path)
+    if where is None and older_than is None:
+        raise ValueError("delete_documents needs at least one filter")
+
+    collection = ctx.chroma_collection
+    deleted_doc_ids = set()
+    deleted_locations = set()
+    deleted_keys = set()
+    deleted = 0
+    offset = 0
+    while True:
+        page = collection.get(
+            where=where, limit=batch_size, offset=offset, include=["metadatas"]
+        )
+        ids = page["ids"]
+        metadatas = page["metadatas"] or [{} for _ in ids]
+        if not ids:
+            break
+
+        matched = [
+            (i, m or {})
+            for i, m in zip(ids, metadatas)
+            if older_than is None or _is_older(m, older_than)
+        ]
+        if matched:
+            collection.delete(ids=[i for i, _ in matched])
+            deleted += len(matched)
+            deleted_doc_ids.update(
+                m["ref_doc_id"] for _, m in matched if "ref_doc_id" in m
+            )
+            deleted_locations.update(
+                m.get("file_path") or m.get("url") for _, m in matched
+            )
+            deleted_keys.update(document_key(m) for _, m in matched)
+
+        if len(ids) < batch_size:
+            break
+        # Deleted ids drop out of later pages; skip only past the ones kept
+        offset += len(ids) - len(matched)
+
+    # Drop or shrink the summaries of the affected documents
+    if deleted_keys and get_summary_collection(ctx) is not None:
+        update_summary_index(ctx, deleted_keys)
+
+    _forget_documents(ctx, deleted_doc_ids)
+    # Deleted sources must be parsed again the next time they are loaded
+    if ctx.ingest_manifest is not None:
+        ctx.ingest_manifest.forget(loc for loc in deleted_locations if loc)
+    ctx.query_engine = None
+
+    logger.info("Deleted %d chunks from %s", deleted, collection.name)
+    return deleted
+
+
+def _build_where(
+    doc_ids: Optional[List[str]],
+    source: Optional[str],
+    url: Optional[str],
+    file_path: Optional[str],
+) -> Optional[Dict[str, Any]]:
+    clauses: List[Dict[str, Any]] = []
+    if doc_ids:
+        clauses.append({"ref_doc_id": {"$in": list(doc_ids)}})
+    if source is not None:
+        clauses.append({"source": source})
+    if url is not None:
+        clauses.append({"url": url})
+    if file_path is not None:
+        clauses.append({"file_path": file_path})
+
+    if not clauses:
+        return None
+    if len(clauses) == 1:
+        return clauses[0]
+    return {"$and": clauses}
+
+
+def _is_older(metadata: Optional[Dict[str, Any]], older_than: str) -> bool:
+    for field in DATE_FIELDS:
+        value = (metadata or {}).get(field)
+        if value:
+            # ISO dates and datetimes compare correctly as strings
+            return str(value) < older_than
+    return False
+
+
+def _forget_documents(ctx: RAGContext, doc_ids: set) -> None:
+    """Drop deleted documents from ctx.documents and the spill store."""
+    if not doc_ids:
+        return
+
+    removed = [d for d in ctx.documents if _doc_id(d) in doc_ids]
+    ctx.documents = [d for d in ctx.documents if _doc_id(d) not in doc_ids]
+    if ctx.document_store is not None and removed:
+        ctx.document_store.delete([_doc_id(d) for d in removed])
+
+
+def _doc_id(doc: Any) -> Optional[str]:
+    return getattr(doc, "doc_id", None)
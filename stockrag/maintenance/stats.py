@@ -1,32 +1,160 @@
 """Knowledge base statistics."""
 
-from typing import Dict, Any
+import gc
+import os
+import random
+import sys
+import tempfile
+import tracemalloc
+from types import FunctionType, ModuleType
+from typing import Any, Dict, Iterable
+
+from llama_index.core import Document
 
 from stockrag.core.context import RAGContext
+from stockrag.index.spill import (
+    RETENTION_MODES,
+    DocumentSpillStore,
+    release_documents,
+)
 
 
-def get_stats(ctx: RAGContext) -> Dict[str, Any]:
+def get_stats(ctx: RAGContext, measure_memory: bool = False) -> Dict[str, Any]:
     """
     Get statistics about the knowledge base.
 
     Args:
         ctx: RAGContext instance
+        measure_memory: Also walk ctx.documents to report
+            resident_document_bytes (proportional to the corpus size)
 
     Returns:
         Dictionary with statistics including:
         - total_documents: Total number of documents
         - documents_by_source: Count of documents by source type
+        - total_text_chars: Characters of text across all documents
+        - resident_text_chars: Characters of text still held in memory
+        - resident_document_bytes: Memory held by ctx.documents (Documents
+          or descriptors, with their metadata and relationships); only with
+          measure_memory
         - ticker: Company ticker
         - company_name: Company name
     """
     doc_sources: Dict[str, int] = {}
+    total_chars = 0
+    resident_chars = 0
     for doc in ctx.documents:
         source = doc.metadata.get("source", "Unknown")
         doc_sources[source] = doc_sources.get(source, 0) + 1
+        # Released documents are descriptors; don't load their text back
+        if isinstance(doc, Document):
+            resident_chars += len(doc.text or "")
+            total_chars += len(doc.text or "")
+        else:
+            total_chars += doc.size
 
-    return {
+    stats = {
         "total_documents": len(ctx.documents),
         "documents_by_source": doc_sources,
+        "total_text_chars": total_chars,
+        "resident_text_chars": resident_chars,
         "ticker": ctx.ticker,
         "company_name": ctx.company_name,
     }
+    if measure_memory:
+        stats["resident_document_bytes"] = deep_size(ctx.documents)
+    return stats
+
+
+def deep_size(root: Any) -> int:
+    """
+    Bytes of the object graph reachable from root.
+
+    Objects shared within the graph are counted once; classes, modules,
+    functions and spill stores (shared across documents) are not counted.
+    """
+    seen = set()
+    stack = [root]
+    total = 0
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen or isinstance(
+            obj, (type, ModuleType, FunctionType, DocumentSpillStore)
+        ):
+            continue
+        seen.add(id(obj))
+        total += sys.getsizeof(obj)
+        stack.extend(gc.get_referents(obj))
+    return total
+
+
+def benchmark_document_retention(
+    num_documents: int = 200,
+    chars_per_document: int = 50_000,
+    modes: Iterable[str] = RETENTION_MODES,
+) -> Dict[str, Dict[str, int]]:
+    """
+    Measure per-context memory kept by each document retention mode.
+
+    For each mode a fresh context loads synthetic Documents under
+    tracemalloc and then runs release_documents, as build_index does.
+
+    Args:
+        num_documents: Documents loaded into the context
+        chars_per_document: Text length of each document
+        modes: Retention modes to measure
+
+    Returns:
+        Mapping of mode -> {"loaded_bytes", "retained_bytes", "deep_size_bytes"}:
+        traced memory after loading, traced memory still held after release,
+        and the size of ctx.documents after release
+    """
+    vocabulary = [f"word{i}" for i in range(2000)]
+    results: Dict[str, Dict[str, int]] = {}
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    try:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            for mode in modes:
+                ctx = RAGContext("BENCH", "Benchmark", document_retention=mode)
+                if mode == "spill":
+                    ctx.document_store = DocumentSpillStore(
+                        os.path.join(tmpdir, "documents.sqlite")
+                    )
+
+                gc.collect()
+                before, _ = tracemalloc.get_traced_memory()
+                for i in range(num_documents):
+                    rng = random.Random(i)
+                    words = []
+                    length = 0
+                    while length < chars_per_document:
+                        words.append(rng.choice(vocabulary))
+                        length += len(words[-1]) + 1
+                    ctx.documents.append(
+                        Document(
+                            text=" ".join(words),
+                            metadata={"source": "Benchmark", "file_path": f"doc{i}"},
+                        )
+                    )
+                    del words
+                gc.collect()
+                loaded, _ = tracemalloc.get_traced_memory()
+
+                release_documents(ctx)
+                gc.collect()
+                retained, _ = tracemalloc.get_traced_memory()
+
+                results[mode] = {
+                    "loaded_bytes": loaded - before,
+                    "retained_bytes": retained - before,
+                    "deep_size_bytes": deep_size(ctx.documents),
+                }
+                if ctx.document_store is not None:
+                    ctx.document_store.close()
+                del ctx
+    finally:
+        if started:
+            tracemalloc.stop()
+    return results
@@ -1,7 +1,7 @@
 """Index update operations."""
 
 import logging
-from typing import List
+from typing import List, Optional
 
 logger = logging.getLogger(__name__)
 
@@ -9,8 +9,20 @@ from llama_index.core import Document
 
 from stockrag.core.context import RAGContext
 from stockrag.core.exceptions import IndexNotBuiltError
+from stockrag.facts.extract import extract_facts
+from stockrag.index.hierarchy import (
+    document_keys,
+    get_summary_collection,
+    update_summary_index,
+)
+from stockrag.index.spill import release_documents
+from stockrag.loaders.feeds import FeedState
+from stockrag.loaders.news import load_news_releases, news_state_path
+from stockrag.maintenance.delete import delete_documents
+from stockrag.profiling import profiled
 
 
+@profiled
 def update_with_new_data(ctx: RAGContext, new_documents: List[Document]) -> None:
     """
     Add new documents to existing index.
@@ -25,12 +37,68 @@ def update_with_new_data(ctx: RAGContext, new_documents: List[Document]) -> None
     if not ctx.index:
         raise IndexNotBuiltError()
 
+    if not new_documents:
+        logger.info("No new documents to add")
+        return
+
     logger.info("Adding %d new documents to index...", len(new_documents))
 
     for doc in new_documents:
         ctx.index.insert(doc)
 
+    if ctx.ingest_manifest is not None:
+        ctx.ingest_manifest.commit(ctx.chroma_collection)
+
+    # Keep the summary level in step with the chunks of the new documents
+    if get_summary_collection(ctx) is not None:
+        update_summary_index(ctx, document_keys(new_documents))
+        ctx.query_engine = None
+
+    extract_facts(ctx, new_documents)
+
     # Also add to context documents list
     ctx.documents.extend(new_documents)
+    release_documents(ctx)
 
     logger.info("Index updated!")
+
+
+def refresh_news(
+    ctx: RAGContext,
+    rss_url: Optional[str] = None,
+    news_urls: Optional[List[str]] = None,
+) -> List[Document]:
+    """
+    Poll news sources and index only items that are new or changed.
+
+    Unchanged feeds and articles cost one conditional GET each. Chunks of
+    articles that changed since they were indexed are replaced. The feed
+    state is saved only after the index update succeeds, so a failed
+    update is retried on the next poll.
+
+    Args:
+        ctx: RAGContext with index built
+        rss_url: Optional RSS or Atom feed URL
+        news_urls: Optional list of news article URLs
+
+    Returns:
+        The documents that were added to the index
+
+    Raises:
+        IndexNotBuiltError: If index is not built
+    """
+    if not ctx.index:
+        raise IndexNotBuiltError()
+
+    state = FeedState(news_state_path(ctx))
+    new_documents = load_news_releases(
+        ctx, rss_url, news_urls, add_to_context=False, state=state
+    )
+
+    if new_documents:
+        for doc in new_documents:
+            delete_documents(ctx, url=doc.metadata["url"])
+        update_with_new_data(ctx, new_documents)
+
+    state.save()
+    return new_documents
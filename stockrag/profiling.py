@@ -0,0 +1,299 @@
+"""
+Opt-in CPU and memory profiling of the stockrag pipeline.
+
+Enable per run without code changes, either through the environment:
+
+    STOCKRAG_PROFILE=./profile python main.py
+
+or by launching the script through this module:
+
+    python -m stockrag.profiling -o ./profile main.py
+
+Every profiled stage (load_*, build_index, update_with_new_data, query,
+query_with_filters) is then sampled for CPU stacks and measured with
+tracemalloc (tracemalloc slows allocation-heavy Python code several times
+over; set STOCKRAG_PROFILE_MEMORY=0 or pass --no-memory for CPU only).
+On exit the output directory contains:
+
+    cpu.collapsed    Flamegraph-compatible collapsed stacks, rooted at the stage
+    allocations.txt  Top allocation sites per stage run
+    stages.json      Wall/CPU time and traced memory per stage run
+"""
+
+import argparse
+import atexit
+import functools
+import json
+import logging
+import os
+import runpy
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+PROFILE_ENV = "STOCKRAG_PROFILE"
+INTERVAL_ENV = "STOCKRAG_PROFILE_INTERVAL_MS"
+MEMORY_ENV = "STOCKRAG_PROFILE_MEMORY"
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+_profiler: Optional["Profiler"] = None
+_profiler_lock = threading.Lock()
+
+
+class Profiler:
+    """Stack sampler plus per-stage tracemalloc snapshots."""
+
+    def __init__(
+        self,
+        output_dir: str,
+        interval: float = 0.005,
+        trace_memory: bool = True,
+        top_allocations: int = 25,
+    ):
+        self.output_dir = output_dir
+        self.interval = interval
+        self.trace_memory = trace_memory
+        self.top_allocations = top_allocations
+        os.makedirs(output_dir, exist_ok=True)
+
+        self._stacks: Counter = Counter()
+        self._active: Dict[int, List[str]] = {}
+        self._records: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+        # Start a fresh allocations report for this run
+        open(os.path.join(output_dir, "allocations.txt"), "w").close()
+
+        self._sampler = threading.Thread(
+            target=self._sample, name="stockrag-profiler", daemon=True
+        )
+        self._sampler.start()
+        atexit.register(self.close)
+
+    def run(self, stage: str, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Call fn(*args, **kwargs) as a profiled stage."""
+        tid = threading.get_ident()
+        with self._lock:
+            stages = self._active.setdefault(tid, [])
+            outermost = not stages
+            stages.append(stage)
+
+        # Nested stages only label stacks; memory is measured at the outer stage
+        if not outermost:
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                with self._lock:
+                    stages.pop()
+
+        before = None
+        if self.trace_memory:
+            before = tracemalloc.take_snapshot()
+            tracemalloc.reset_peak()
+        wall_start = time.perf_counter()
+        cpu_start = time.thread_time()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            wall = time.perf_counter() - wall_start
+            cpu = time.thread_time() - cpu_start
+            peak, after = 0, None
+            if before is not None:
+                _, peak = tracemalloc.get_traced_memory()
+                after = tracemalloc.take_snapshot()
+            with self._lock:
+                stages.pop()
+            self._record(stage, wall, cpu, peak, before, after)
+
+    def close(self) -> None:
+        """Stop sampling and write collapsed stacks and the stage summary."""
+        if self._stop.is_set():
+            return
+        self._stop.set()
+        self._sampler.join(timeout=1.0)
+
+        with self._lock:
+            stacks = sorted(self._stacks.items())
+            records = list(self._records)
+
+        with open(os.path.join(self.output_dir, "cpu.collapsed"), "w") as f:
+            for stack, count in stacks:
+                f.write(f"{stack} {count}\n")
+        with open(os.path.join(self.output_dir, "stages.json"), "w") as f:
+            json.dump(records, f, indent=2)
+
+        logger.info("Profile written to %s", self.output_dir)
+
+    def _sample(self) -> None:
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            with self._lock:
+                active = {tid: list(s) for tid, s in self._active.items() if s}
+            for tid, stages in active.items():
+                frame = frames.get(tid)
+                if frame is None:
+                    continue
+                names = []
+                while frame is not None:
+                    code = frame.f_code
+                    filename = os.path.basename(code.co_filename)
+                    names.append(f"{code.co_name} ({filename}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                names.reverse()
+                stack = ";".join(
+                    [f"stage:{'/'.join(stages)}"] + [n.replace(";", ":") for n in names]
+                )
+                with self._lock:
+                    self._stacks[stack] += 1
+
+    def _record(
+        self,
+        stage: str,
+        wall: float,
+        cpu: float,
+        peak: int,
+        before: Optional[tracemalloc.Snapshot],
+        after: Optional[tracemalloc.Snapshot],
+    ) -> None:
+        diff: List[tracemalloc.StatisticDiff] = []
+        if before is not None and after is not None:
+            exclude = [
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, __file__),
+            ]
+            diff = after.filter_traces(exclude).compare_to(
+                before.filter_traces(exclude), "lineno"
+            )
+        net = sum(stat.size_diff for stat in diff)
+        top = [stat for stat in diff if stat.size_diff > 0][: self.top_allocations]
+        max_rss = _max_rss_bytes()
+
+        with self._lock:
+            run = sum(1 for r in self._records if r["stage"] == stage) + 1
+            self._records.append(
+                {
+                    "stage": stage,
+                    "run": run,
+                    "wall_seconds": round(wall, 6),
+                    "cpu_seconds": round(cpu, 6),
+                    "peak_traced_bytes": peak,
+                    "net_allocated_bytes": net,
+                    "max_rss_bytes": max_rss,
+                }
+            )
+
+        with open(os.path.join(self.output_dir, "allocations.txt"), "a") as f:
+            f.write(
+                f"== {stage} (run {run}): wall {wall:.3f}s, cpu {cpu:.3f}s, "
+                f"peak {peak / 1e6:.1f} MB, net {net / 1e6:+.1f} MB, "
+                f"max RSS {max_rss / 1e6:.1f} MB\n"
+            )
+            for stat in top:
+                frame = stat.traceback[0]
+                f.write(
+                    f"{stat.size_diff / 1e3:+12.1f} KB {stat.count_diff:+8d} blocks  "
+                    f"{frame.filename}:{frame.lineno}\n"
+                )
+            f.write("\n")
+
+
+def _max_rss_bytes() -> int:
+    """Peak resident set size of the process so far (0 where unsupported)."""
+    try:
+        import resource
+    except ImportError:
+        return 0
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return rss if sys.platform == "darwin" else rss * 1024
+
+
+def enable_profiling(
+    output_dir: str,
+    interval_ms: float = 5.0,
+    trace_memory: bool = True,
+) -> Profiler:
+    """
+    Turn profiling on for the rest of the process.
+
+    Args:
+        output_dir: Directory for the profile outputs
+        interval_ms: CPU sampling interval in milliseconds
+        trace_memory: Take tracemalloc snapshots per stage
+
+    Returns:
+        The active Profiler
+    """
+    global _profiler
+    with _profiler_lock:
+        if _profiler is None:
+            _profiler = Profiler(
+                output_dir, interval=interval_ms / 1000.0, trace_memory=trace_memory
+            )
+            logger.info("Profiling enabled, writing to %s", output_dir)
+        return _profiler
+
+
+def _active_profiler() -> Optional[Profiler]:
+    if _profiler is not None:
+        return _profiler
+    output_dir = os.environ.get(PROFILE_ENV)
+    if not output_dir:
+        return None
+    if output_dir.lower() in ("1", "true", "yes"):
+        output_dir = "./stockrag_profile"
+    return enable_profiling(
+        output_dir,
+        interval_ms=float(os.environ.get(INTERVAL_ENV, "5")),
+        trace_memory=os.environ.get(MEMORY_ENV, "1").lower()
+        not in ("0", "false", "no"),
+    )
+
+
+def profiled(fn: F) -> F:
+    """Mark a pipeline function as a profiling stage named after it."""
+
+    @functools.wraps(fn)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        profiler = _active_profiler()
+        if profiler is None:
+            return fn(*args, **kwargs)
+        return profiler.run(fn.__name__, fn, *args, **kwargs)
+
+    return wrapper  # type: ignore[return-value]
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m stockrag.profiling",
+        description="Run a script with stockrag stage profiling enabled.",
+    )
+    parser.add_argument("-o", "--output", default="./stockrag_profile")
+    parser.add_argument("-i", "--interval-ms", type=float, default=5.0)
+    parser.add_argument("--no-memory", action="store_true", help="CPU sampling only")
+    parser.add_argument("script")
+    parser.add_argument("args", nargs=argparse.REMAINDER)
+    options = parser.parse_args(argv)
+
+    # Set through the environment: under -m this file runs as __main__, a
+    # different module object from the stockrag.profiling the stages import
+    os.environ[PROFILE_ENV] = options.output
+    os.environ[INTERVAL_ENV] = str(options.interval_ms)
+    os.environ[MEMORY_ENV] = "0" if options.no_memory else "1"
+    sys.argv = [options.script] + options.args
+    sys.path.insert(0, os.path.dirname(os.path.abspath(options.script)))
+    runpy.run_path(options.script, run_name="__main__")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,9 +3,20 @@
 from stockrag.query.engine import create_query_engine
 from stockrag.query.basic import query
 from stockrag.query.filters import query_with_filters
+from stockrag.query.facts import query_with_facts, answer_from_facts
+from stockrag.query.workers import (
+    QueryWorkerPool,
+    publish_snapshot,
+    start_query_workers,
+)
 
 __all__ = [
     "create_query_engine",
     "query",
     "query_with_filters",
+    "query_with_facts",
+    "answer_from_facts",
+    "start_query_workers",
+    "publish_snapshot",
+    "QueryWorkerPool",
 ]
@@ -7,8 +7,10 @@ logger = logging.getLogger(__name__)
 
 from stockrag.core.context import RAGContext
 from stockrag.query.engine import create_query_engine
+from stockrag.profiling import profiled
 
 
+@profiled
 def query(
     ctx: RAGContext,
     question: str,
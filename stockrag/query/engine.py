@@ -1,9 +1,13 @@
 """Query engine creation and configuration."""
 
-from typing import Any
+from typing import Any, Optional
+
+from llama_index.core.query_engine import RetrieverQueryEngine
 
 from stockrag.core.context import RAGContext
 from stockrag.core.exceptions import IndexNotBuiltError
+from stockrag.index.hierarchy import get_summary_collection
+from stockrag.query.hierarchical import HierarchicalRetriever
 
 
 def create_query_engine(
@@ -11,6 +15,9 @@ def create_query_engine(
     similarity_top_k: int = 5,
     response_mode: str = "compact",
     verbose: bool = True,
+    hierarchical: Optional[bool] = None,
+    top_documents: int = 3,
+    top_sections: int = 5,
 ) -> Any:
     """
     Create and configure query engine.
@@ -20,16 +27,43 @@ def create_query_engine(
         similarity_top_k: Number of similar documents to retrieve
         response_mode: Response mode ("compact", "refine", "tree_summarize")
         verbose: Enable verbose output
+        hierarchical: Use two-stage retrieval over the summary index
+            (default: whenever build_index(..., hierarchical=True) was run)
+        top_documents: Documents routed to in hierarchical mode
+        top_sections: Sections searched in hierarchical mode
 
     Returns:
         Query engine instance (also stored in ctx.query_engine)
 
     Raises:
-        IndexNotBuiltError: If index is not built
+        IndexNotBuiltError: If index (or the requested summary index) is not built
     """
     if not ctx.index:
         raise IndexNotBuiltError()
 
+    summary_collection = (
+        get_summary_collection(ctx) if hierarchical is not False else None
+    )
+    if hierarchical and summary_collection is None:
+        raise IndexNotBuiltError(
+            "Summary index not built. Call build_index(ctx, hierarchical=True) first."
+        )
+
+    if summary_collection is not None:
+        retriever = HierarchicalRetriever(
+            chunk_collection=ctx.chroma_collection,
+            summary_collection=summary_collection,
+            similarity_top_k=similarity_top_k,
+            top_documents=top_documents,
+            top_sections=top_sections,
+        )
+        ctx.query_engine = RetrieverQueryEngine.from_args(
+            retriever,
+            response_mode=response_mode,
+            verbose=verbose,
+        )
+        return ctx.query_engine
+
     ctx.query_engine = ctx.index.as_query_engine(
         similarity_top_k=similarity_top_k,
         response_mode=response_mode,
@@ -0,0 +1,205 @@
+"""Fast path answering numeric questions from the fact store."""
+
+import logging
+import re
+from typing import Any, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+from llama_index.core.base.response.schema import Response
+
+from stockrag.core.context import RAGContext
+from stockrag.facts.store import FinancialFact
+from stockrag.query.basic import query
+
+# Question phrase -> canonical metric (matched longest first)
+QUESTION_METRICS = {
+    "revenue": "revenue",
+    "revenues": "revenue",
+    "net sales": "revenue",
+    "total net sales": "revenue",
+    "sales": "revenue",
+    "net income": "net_income",
+    "net profit": "net_income",
+    "profit": "net_income",
+    "earnings": "net_income",
+    "gross margin": "gross_margin",
+    "gross profit": "gross_margin",
+    "operating income": "operating_income",
+    "operating profit": "operating_income",
+    "income from operations": "operating_income",
+    "research and development": "research_and_development",
+    "r&d": "research_and_development",
+    "total assets": "total_assets",
+    "total liabilities": "total_liabilities",
+    "cash and cash equivalents": "cash_and_equivalents",
+    "operating cash flow": "operating_cash_flow",
+    "cash from operations": "operating_cash_flow",
+}
+
+# Questions needing explanation or comparison always go to the LLM
+_LLM_ONLY_RE = re.compile(
+    r"\b(why|how|explain|describe|compare|compared|versus|vs|trend|drivers?|"
+    r"impact|growth|grow|change|changed|increase|decrease|segments?|per share|"
+    r"quarter|q[1-4]|guidance|outlook)\b"
+)
+_FISCAL_YEAR_RE = re.compile(r"\b(?:fy|fiscal(?: year)?)\s*'?(\d{4}|\d{2})\b")
+_YEAR_RE = re.compile(r"\b((?:19|20)\d{2})\b")
+_PREVIOUS_RE = re.compile(r"\b(previous|prior|preceding)\b|\byear before\b")
+_WORD_RE = re.compile(r"[a-z0-9&]+")
+
+# Words that may surround the metric and period without qualifying them
+_STOP_WORDS = set("""
+    what was were is are did does do how much the a an of in for during at on to s
+    company its their our total net reported amount value figure last latest most
+    recent current this previous prior preceding year fiscal fy annual ended ending
+    before spend spent
+    """.split())
+
+
+def parse_numeric_question(
+    question: str, names: Iterable[str] = ()
+) -> Optional[Tuple[str, Optional[str], int]]:
+    """
+    Recognize simple "what was <metric> in <period>" questions.
+
+    Any word besides the metric, the period, stop words and the company's
+    names (e.g. "iPhone revenue", "revenue from Services") qualifies the
+    metric, so the question is not treated as a plain lookup.
+
+    Args:
+        question: Natural language question
+        names: Ticker and company name allowed in the question
+
+    Returns:
+        (metric, explicit period or None, offset from latest period), or None
+        if the question is not a plain numeric lookup
+    """
+    text = question.lower().strip()
+    if not text.startswith(("what", "how much")) or _LLM_ONLY_RE.search(
+        text.replace("how much", "")
+    ):
+        return None
+
+    metrics = set()
+    remaining = text
+    for phrase in sorted(QUESTION_METRICS, key=len, reverse=True):
+        pattern = rf"\b{re.escape(phrase)}(?!\w)"
+        if re.search(pattern, remaining):
+            metrics.add(QUESTION_METRICS[phrase])
+            remaining = re.sub(pattern, " ", remaining)
+    if len(metrics) != 1:
+        return None
+    metric = metrics.pop()
+
+    remaining = _YEAR_RE.sub(" ", _FISCAL_YEAR_RE.sub(" ", remaining))
+    allowed = _STOP_WORDS | {
+        w for name in names for w in _WORD_RE.findall(name.lower())
+    }
+    if any(word not in allowed for word in _WORD_RE.findall(remaining)):
+        return None
+
+    match = _FISCAL_YEAR_RE.search(text) or _YEAR_RE.search(text)
+    previous = _PREVIOUS_RE.search(text)
+    if match and previous:
+        # "the year before 2024" is relative to the year named; leave it to the LLM
+        return None
+    if match:
+        year = match.group(1)
+        year = f"20{year}" if len(year) == 2 else year
+        return metric, f"FY{year}", 0
+    return metric, None, 1 if previous else 0
+
+
+def answer_from_facts(ctx: RAGContext, question: str) -> Optional[Response]:
+    """
+    Answer a numeric question directly from ctx.fact_store.
+
+    Args:
+        ctx: RAGContext with fact_store configured
+        question: Natural language question
+
+    Returns:
+        Response built from the stored fact, or None if the question is not a
+        plain lookup or the fact is not stored
+    """
+    if ctx.fact_store is None:
+        return None
+
+    parsed = parse_numeric_question(question, names=(ctx.ticker, ctx.company_name))
+    if parsed is None:
+        return None
+    metric, period, offset = parsed
+
+    if period is None:
+        periods = ctx.fact_store.periods(ctx.ticker, metric)
+        if len(periods) <= offset:
+            return None
+        period = periods[offset]
+
+    fact = ctx.fact_store.get(ctx.ticker, metric, period)
+    if fact is None:
+        return None
+
+    return Response(
+        response=_format_answer(ctx, fact),
+        source_nodes=[],
+        metadata={
+            "fact_store": True,
+            "metric": fact.metric,
+            "period": fact.period,
+            "value": fact.value,
+            "unit": fact.unit,
+            "source": fact.source,
+            "location": fact.location,
+        },
+    )
+
+
+def query_with_facts(
+    ctx: RAGContext,
+    question: str,
+    print_sources: bool = True,
+) -> Any:
+    """
+    Query the knowledge base, answering plain numeric lookups from the fact store.
+
+    Questions such as "What was the revenue in the last fiscal year?" are
+    answered in milliseconds without retrieval or an LLM call; anything else
+    falls back to query().
+
+    Args:
+        ctx: RAGContext with index built
+        question: Natural language question
+        print_sources: Print source documents used
+
+    Returns:
+        Response from the fact store or the LLM
+    """
+    response = answer_from_facts(ctx, question)
+    if response is None:
+        return query(ctx, question, print_sources=print_sources)
+
+    logger.info("Query: %s", question)
+    if print_sources:
+        logger.info("Sources:")
+        logger.info(
+            "- %s: %s", response.metadata["source"], response.metadata["location"]
+        )
+    return response
+
+
+def _format_answer(ctx: RAGContext, fact: FinancialFact) -> str:
+    label = fact.metric.replace("_", " ")
+    return f"{ctx.company_name} {label} for {fact.period} was {_format_value(fact)}."
+
+
+def _format_value(fact: FinancialFact) -> str:
+    if fact.unit != "USD":
+        return f"{fact.value:,.2f} {fact.unit}"
+    sign = "-" if fact.value < 0 else ""
+    value = abs(fact.value)
+    for scale, name in ((1e12, "trillion"), (1e9, "billion"), (1e6, "million")):
+        if value >= scale:
+            return f"{sign}${value / scale:,.2f} {name}"
+    return f"{sign}${value:,.0f}"
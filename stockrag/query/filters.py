@@ -6,8 +6,10 @@ from llama_index.core.vector_stores import MetadataFilters, ExactMatchFilter
 
 from stockrag.core.context import RAGContext
 from stockrag.core.exceptions import IndexNotBuiltError
+from stockrag.profiling import profiled
 
 
+@profiled
 def query_with_filters(
     ctx: RAGContext,
     question: str,
@@ -0,0 +1,105 @@
+"""Two-stage retrieval: route to documents and sections, then search their chunks."""
+
+import json
+import logging
+from typing import Any, List
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+from llama_index.core import QueryBundle, Settings
+from llama_index.core.retrievers import BaseRetriever
+from llama_index.core.schema import NodeWithScore
+from llama_index.core.vector_stores.utils import metadata_dict_to_node
+
+from stockrag.index.hierarchy import LEVEL_DOCUMENT, LEVEL_SECTION
+
+
+class HierarchicalRetriever(BaseRetriever):
+    """
+    Retriever that searches only chunks of the best matching sections.
+
+    Stage 1 ranks document summaries and then section summaries within the
+    top documents. Stage 2 scores just the chunks of those sections, so
+    retrieval cost and noise stay flat as the per-ticker corpus grows.
+    """
+
+    def __init__(
+        self,
+        chunk_collection: Any,
+        summary_collection: Any,
+        similarity_top_k: int = 5,
+        top_documents: int = 3,
+        top_sections: int = 5,
+        embed_model: Any = None,
+        **kwargs: Any,
+    ) -> None:
+        self._chunks = chunk_collection
+        self._summaries = summary_collection
+        self._similarity_top_k = similarity_top_k
+        self._top_documents = top_documents
+        self._top_sections = top_sections
+        self._embed_model = embed_model or Settings.embed_model
+        super().__init__(**kwargs)
+
+    def _retrieve(self, query_bundle: QueryBundle) -> List[NodeWithScore]:
+        embedding = query_bundle.embedding or self._embed_model.get_query_embedding(
+            query_bundle.query_str
+        )
+
+        # Stage 1a: route to documents
+        doc_hits = self._summaries.query(
+            query_embeddings=[embedding],
+            n_results=self._top_documents,
+            where={"level": LEVEL_DOCUMENT},
+            include=["metadatas"],
+        )
+        doc_keys = [m["document_key"] for m in doc_hits["metadatas"][0]]
+        if not doc_keys:
+            return []
+
+        # Stage 1b: route to sections within those documents
+        section_hits = self._summaries.query(
+            query_embeddings=[embedding],
+            n_results=self._top_sections,
+            where={
+                "$and": [
+                    {"level": LEVEL_SECTION},
+                    {"document_key": {"$in": doc_keys}},
+                ]
+            },
+            include=["metadatas"],
+        )
+        node_ids: List[str] = []
+        for metadata in section_hits["metadatas"][0]:
+            node_ids.extend(json.loads(metadata["node_ids"]))
+        if not node_ids:
+            return []
+
+        # Stage 2: exact scoring over the selected chunks only
+        chunks = self._chunks.get(
+            ids=node_ids, include=["embeddings", "documents", "metadatas"]
+        )
+        if not chunks["ids"]:
+            return []
+
+        matrix = np.asarray(chunks["embeddings"], dtype=np.float32)
+        query = np.asarray(embedding, dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1) * (np.linalg.norm(query) or 1.0)
+        scores = matrix @ query / np.where(norms > 0, norms, 1.0)
+        top = np.argsort(-scores)[: self._similarity_top_k]
+
+        logger.debug(
+            "Hierarchical retrieval: %d documents, %d sections, %d chunks scored",
+            len(doc_keys),
+            len(section_hits["metadatas"][0]),
+            len(chunks["ids"]),
+        )
+
+        results = []
+        for i in top:
+            node = metadata_dict_to_node(chunks["metadatas"][i])
+            node.set_content(chunks["documents"][i] or "")
+            results.append(NodeWithScore(node=node, score=float(scores[i])))
+        return results
@@ -0,0 +1,344 @@
+"""Multi-process read-only query serving over a shared index snapshot."""
+
+import gzip
+import json
+import logging
+import mmap
+import multiprocessing
+import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+from llama_index.core import QueryBundle, Settings
+from llama_index.core.base.embeddings.base import BaseEmbedding
+from llama_index.core.query_engine import RetrieverQueryEngine
+from llama_index.core.retrievers import BaseRetriever
+from llama_index.core.schema import NodeWithScore
+from llama_index.core.vector_stores.utils import metadata_dict_to_node
+
+from stockrag.core.context import RAGContext
+from stockrag.core.exceptions import IndexNotBuiltError
+from stockrag.index.persistence import (
+    EMBEDDINGS_FILE,
+    MANIFEST_FILE,
+    RECORDS_FILE,
+    check_compatible,
+    export_snapshot,
+    load_projection,
+    read_manifest,
+)
+
+RECORDS_TEXT_FILE = "records.jsonl"
+OFFSETS_FILE = "record_offsets.npy"
+
+# Versioned serving snapshots kept next to the published one
+_KEPT_SNAPSHOTS = 2
+
+# Per-worker state, set by _init_worker
+_embeddings: Optional[np.ndarray] = None
+_reducer: Any = None
+_block_rows = 16384
+
+
+class QueryWorkerPool:
+    """
+    Pool of read-only query worker processes sharing one index.
+
+    Workers serve from an index snapshot (see export_snapshot): the
+    float16 embedding matrix is memory-mapped, so every worker shares the
+    same page cache instead of opening its own Chroma client. The front
+    end embeds each question once with its own model; workers hold no
+    model, only the matrix and the snapshot's projection, and score all
+    chunks exactly. The front end resolves the top hits and runs response
+    synthesis, which is I/O-bound on the LLM and fine to do from many
+    threads.
+
+    The pool is pinned to the snapshot version snapshot_path resolves to
+    when it starts, so a later refresh does not change files under it.
+
+    Workers are started with "forkserver" where available, else "spawn",
+    so the pool is safe to start after the front end has built the index
+    or run queries; forking after inference can deadlock native thread
+    pools.
+
+    Usage:
+        pool = start_query_workers(ctx, workers=8)
+        response = pool.query("What was the revenue in the last fiscal year?")
+        pool.close()
+    """
+
+    def __init__(
+        self,
+        ctx: RAGContext,
+        snapshot_path: str,
+        workers: Optional[int] = None,
+        similarity_top_k: int = 5,
+        response_mode: str = "compact",
+        start_method: Optional[str] = None,
+    ):
+        self.snapshot_path = snapshot_path = os.path.realpath(snapshot_path)
+        self.similarity_top_k = similarity_top_k
+        self.workers = workers or os.cpu_count() or 1
+
+        manifest = read_manifest(snapshot_path)
+        check_compatible(ctx, manifest)
+        _prepare_records(snapshot_path)
+
+        self._offsets = np.load(os.path.join(snapshot_path, OFFSETS_FILE))
+        self._records_file = open(os.path.join(snapshot_path, RECORDS_TEXT_FILE), "rb")
+        self._records = mmap.mmap(
+            self._records_file.fileno(), 0, access=mmap.ACCESS_READ
+        )
+
+        if start_method is None:
+            available = multiprocessing.get_all_start_methods()
+            start_method = "forkserver" if "forkserver" in available else "spawn"
+        mp_context = multiprocessing.get_context(start_method)
+        self._embed_model = _base_model(Settings.embed_model)
+        embedding = manifest["embedding"]
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=mp_context,
+            initializer=_init_worker,
+            initargs=(
+                snapshot_path,
+                embedding["reduction"],
+                embedding["reduced_dim"],
+                embedding["model_name"],
+            ),
+        )
+
+        # Start the workers now so load errors surface here
+        self._executor.submit(int).result()
+
+        self._engine = RetrieverQueryEngine.from_args(
+            _PoolRetriever(self), response_mode=response_mode
+        )
+        logger.info(
+            "Started %d query workers over %d chunks (%s start)",
+            self.workers,
+            manifest["count"],
+            mp_context.get_start_method(),
+        )
+
+    def retrieve(
+        self, question: str, similarity_top_k: Optional[int] = None
+    ) -> List[NodeWithScore]:
+        """Embed here, search in a worker process; return the top chunks."""
+        query = self._embed_model.get_query_embedding(question)
+        hits = self._executor.submit(
+            _search, query, similarity_top_k or self.similarity_top_k
+        ).result()
+        return [NodeWithScore(node=self._node(row), score=score) for row, score in hits]
+
+    def query(self, question: str) -> Any:
+        """Answer a question, retrieving in a worker process."""
+        return self._engine.query(question)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+        self._records.close()
+        self._records_file.close()
+
+    def __enter__(self) -> "QueryWorkerPool":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def _node(self, row: int) -> Any:
+        start, end = self._offsets[row], self._offsets[row + 1]
+        record = json.loads(self._records[start:end])
+        node = metadata_dict_to_node(record["metadata"])
+        node.set_content(record["document"] or "")
+        return node
+
+
+class _PoolRetriever(BaseRetriever):
+    def __init__(self, pool: QueryWorkerPool, **kwargs: Any) -> None:
+        self._pool = pool
+        super().__init__(**kwargs)
+
+    def _retrieve(self, query_bundle: QueryBundle) -> List[NodeWithScore]:
+        return self._pool.retrieve(query_bundle.query_str)
+
+
+def start_query_workers(
+    ctx: RAGContext,
+    workers: Optional[int] = None,
+    snapshot_path: Optional[str] = None,
+    refresh: bool = False,
+    similarity_top_k: int = 5,
+    response_mode: str = "compact",
+    start_method: Optional[str] = None,
+) -> QueryWorkerPool:
+    """
+    Start a pool of read-only query workers for ctx's index.
+
+    Args:
+        ctx: RAGContext with embedding model configured
+        workers: Worker processes (default: CPU count)
+        snapshot_path: Snapshot to serve (default: serving_snapshot/ under
+            the vector store directory)
+        refresh: Publish a new snapshot of ctx's vector store first (see
+            publish_snapshot). Otherwise serve the existing snapshot (e.g.
+            one shipped from an indexing node), publishing one only if
+            there is none yet
+        similarity_top_k: Number of chunks retrieved per question
+        response_mode: Response mode ("compact", "refine", "tree_summarize")
+        start_method: multiprocessing start method (see QueryWorkerPool)
+
+    Returns:
+        Running QueryWorkerPool; call close() when done
+
+    Raises:
+        IndexNotBuiltError: If there is neither an index nor a snapshot
+    """
+    if snapshot_path is None:
+        if ctx.persist_path is None:
+            raise IndexNotBuiltError("No snapshot path and no vector store path.")
+        snapshot_path = os.path.join(ctx.persist_path, "serving_snapshot")
+
+    exists = os.path.exists(os.path.join(snapshot_path, MANIFEST_FILE))
+    collection = ctx.chroma_collection
+    if (refresh or not exists) and collection is not None and collection.count():
+        publish_snapshot(ctx, snapshot_path)
+    elif not exists:
+        raise IndexNotBuiltError(f"No index snapshot at {snapshot_path}.")
+
+    return QueryWorkerPool(
+        ctx,
+        snapshot_path,
+        workers=workers,
+        similarity_top_k=similarity_top_k,
+        response_mode=response_mode,
+        start_method=start_method,
+    )
+
+
+def publish_snapshot(ctx: RAGContext, snapshot_path: str) -> str:
+    """
+    Export ctx's vector store as a new snapshot version and switch to it.
+
+    The snapshot is written to a fresh `<snapshot_path>.<version>`
+    directory, then snapshot_path, a symlink, is atomically repointed at
+    it with os.replace. Pools already serving an earlier version keep
+    their files untouched; the previous version is kept for them and
+    older ones are removed.
+
+    Args:
+        ctx: RAGContext with a non-empty index
+        snapshot_path: Path pools are started from
+
+    Returns:
+        The new version's directory
+    """
+    snapshot_path = os.path.abspath(snapshot_path)
+    version = f"{snapshot_path}.{time.time_ns()}"
+    export_snapshot(ctx, version)
+    _prepare_records(version)
+
+    if os.path.isdir(snapshot_path) and not os.path.islink(snapshot_path):
+        # Snapshot exported in place before versioning; keep it as the oldest
+        os.rename(snapshot_path, f"{snapshot_path}.0")
+    link = f"{version}.link"
+    os.symlink(os.path.basename(version), link)
+    os.replace(link, snapshot_path)
+    logger.info("Published snapshot %s", version)
+
+    _prune_snapshots(snapshot_path)
+    return version
+
+
+def _prune_snapshots(snapshot_path: str) -> None:
+    parent, name = os.path.split(snapshot_path)
+    prefix = f"{name}."
+    versions = sorted(
+        (
+            int(entry[len(prefix) :])
+            for entry in os.listdir(parent)
+            if entry.startswith(prefix) and entry[len(prefix) :].isdigit()
+        ),
+    )
+    current = os.path.realpath(snapshot_path)
+    for version in versions[:-_KEPT_SNAPSHOTS]:
+        path = os.path.join(parent, f"{prefix}{version}")
+        if path != current:
+            shutil.rmtree(path, ignore_errors=True)
+
+
+def _prepare_records(path: str) -> None:
+    """Unpack records once into a line file with a row offset table."""
+    records = os.path.join(path, RECORDS_FILE)
+    text_path = os.path.join(path, RECORDS_TEXT_FILE)
+    offsets_path = os.path.join(path, OFFSETS_FILE)
+    if os.path.exists(offsets_path) and os.path.getmtime(
+        offsets_path
+    ) >= os.path.getmtime(records):
+        return
+
+    # Written aside and renamed, so pools mapping the old files are unaffected
+    suffix = f".tmp-{os.getpid()}"
+    offsets = [0]
+    with gzip.open(records, "rb") as source, open(text_path + suffix, "wb") as target:
+        for line in source:
+            target.write(line)
+            offsets.append(offsets[-1] + len(line))
+    with open(offsets_path + suffix, "wb") as f:
+        np.save(f, np.asarray(offsets, dtype=np.int64))
+    os.replace(text_path + suffix, text_path)
+    os.replace(offsets_path + suffix, offsets_path)
+
+
+def _base_model(embed_model: BaseEmbedding) -> BaseEmbedding:
+    # Queries are embedded at full dimension and projected by the workers
+    from stockrag.index.reduction import ReducedEmbedding
+
+    if isinstance(embed_model, ReducedEmbedding):
+        return embed_model.base
+    return embed_model
+
+
+def _init_worker(
+    snapshot_path: str,
+    reduction: Optional[str],
+    reduced_dim: Optional[int],
+    model_name: Optional[str],
+) -> None:
+    global _embeddings, _reducer
+
+    _embeddings = np.load(os.path.join(snapshot_path, EMBEDDINGS_FILE), mmap_mode="r")
+
+    if reduction:
+        from stockrag.index.reduction import EmbeddingReducer
+
+        _reducer = EmbeddingReducer(reduction, reduced_dim, model_name, path=None)
+        load_projection(_reducer, snapshot_path)
+
+
+def _search(query: List[float], top_k: int) -> List[Tuple[int, float]]:
+    """Exact cosine search of the memory-mapped matrix, in blocks."""
+    query = np.asarray(query, dtype=np.float32)
+    if _reducer is not None:
+        query = _reducer.transform(query[None, :])[0]
+    query /= np.linalg.norm(query) or 1.0
+
+    best_rows = np.empty(0, dtype=np.int64)
+    best_scores = np.empty(0, dtype=np.float32)
+    for start in range(0, len(_embeddings), _block_rows):
+        block = np.asarray(_embeddings[start : start + _block_rows], dtype=np.float32)
+        norms = np.linalg.norm(block, axis=1)
+        scores = block @ query / np.where(norms > 0, norms, 1.0)
+        k = min(top_k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        best_rows = np.concatenate([best_rows, top + start])
+        best_scores = np.concatenate([best_scores, scores[top]])
+
+    order = np.argsort(-best_scores)[:top_k]
+    return [(int(best_rows[i]), float(best_scores[i])) for i in order]
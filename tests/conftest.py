@@ -0,0 +1,29 @@
+"""Shared fixtures: a context over a real persistent Chroma store."""
+
+import pytest
+
+
+@pytest.fixture
+def rag_context(tmp_path):
+    """RAGContext over a persistent Chroma collection, with mock models."""
+    chromadb = pytest.importorskip("chromadb")
+    pytest.importorskip("llama_index.vector_stores.chroma")
+    from llama_index.core import Settings
+    from llama_index.core.embeddings import MockEmbedding
+    from llama_index.core.llms import MockLLM
+    from llama_index.core.node_parser import SentenceSplitter
+
+    from stockrag.core.context import RAGContext
+    from stockrag.index.persistence import rebind_collection
+
+    Settings.embed_model = MockEmbedding(embed_dim=8)
+    Settings.llm = MockLLM()
+    Settings.node_parser = SentenceSplitter(chunk_size=64, chunk_overlap=0)
+
+    ctx = RAGContext(ticker="AAPL", company_name="Apple Inc.")
+    ctx.persist_path = str(tmp_path / "store")
+    ctx.chroma_client = chromadb.PersistentClient(path=ctx.persist_path)
+    rebind_collection(
+        ctx, ctx.chroma_client.get_or_create_collection("AAPL_knowledge_base")
+    )
+    return ctx
@@ -0,0 +1,79 @@
+"""Compaction of a persisted Chroma collection."""
+
+import os
+
+import pytest
+
+chromadb = pytest.importorskip("chromadb")
+np = pytest.importorskip("numpy")
+pytest.importorskip("llama_index.vector_stores.chroma")
+
+from stockrag.core.context import RAGContext
+from stockrag.index.persistence import rebind_collection
+from stockrag.maintenance.compact import (
+    _marker_path,
+    _stored_vectors,
+    _temp_name,
+    _write_marker,
+    compact_index,
+    recover_compaction,
+)
+
+
+def _context(path, rows=1500, deleted=500):
+    client = chromadb.PersistentClient(path=str(path))
+    collection = client.create_collection("AAPL_knowledge_base")
+    vectors = np.random.default_rng(0).random((rows, 16))
+    for start in range(0, rows, 500):
+        collection.add(
+            ids=[str(i) for i in range(start, start + 500)],
+            embeddings=vectors[start : start + 500].tolist(),
+        )
+    collection.delete(ids=[str(i) for i in range(deleted)])
+
+    ctx = RAGContext(ticker="AAPL", company_name="Apple Inc.")
+    ctx.chroma_client = client
+    rebind_collection(ctx, collection)
+    return ctx
+
+
+def test_stored_vectors_reads_persisted_hnsw_header(tmp_path):
+    ctx = _context(tmp_path)
+    assert ctx.chroma_collection.count() == 1000
+    assert _stored_vectors(str(tmp_path), ctx.chroma_collection) == 1500
+
+
+def test_compaction_reports_reclaimed_vectors(tmp_path):
+    ctx = _context(tmp_path)
+    report = compact_index(ctx)
+
+    assert report["vectors_before"] == 1500
+    assert report["vectors_after"] == 1000
+    assert report["vectors_reclaimed"] == 500
+    assert ctx.chroma_collection.count() == 1000
+    assert not os.path.exists(_marker_path(str(tmp_path), "AAPL_knowledge_base"))
+
+
+def test_recovery_restores_collection_from_complete_copy(tmp_path):
+    ctx = _context(tmp_path)
+    client, name = ctx.chroma_client, ctx.chroma_collection.name
+    # Crash after the copy completed and the original was dropped
+    temp = client.create_collection(_temp_name(name))
+    page = ctx.chroma_collection.get(include=["embeddings"])
+    temp.add(ids=page["ids"], embeddings=page["embeddings"])
+    _write_marker(str(tmp_path), name, temp.count())
+    client.delete_collection(name)
+
+    assert recover_compaction(client, name)
+    assert client.get_collection(name).count() == 1000
+    assert _temp_name(name) not in [c.name for c in client.list_collections()]
+
+
+def test_recovery_drops_incomplete_copy(tmp_path):
+    ctx = _context(tmp_path)
+    client, name = ctx.chroma_client, ctx.chroma_collection.name
+    client.create_collection(_temp_name(name))
+
+    assert not recover_compaction(client, name)
+    assert client.get_collection(name).count() == 1000
+    assert _temp_name(name) not in [c.name for c in client.list_collections()]
@@ -0,0 +1,61 @@
+"""Numeric question parsing and line item extraction for the fact fast path."""
+
+import pytest
+
+pytest.importorskip("llama_index.core")
+
+from stockrag.facts.extract import extract_line_items
+from stockrag.query.facts import parse_numeric_question
+
+NAMES = ("AAPL", "Apple Inc.")
+
+
+@pytest.mark.parametrize(
+    "question, expected",
+    [
+        ("What was the revenue in the last fiscal year?", ("revenue", None, 0)),
+        ("What was Apple's revenue in FY2024?", ("revenue", "FY2024", 0)),
+        ("What were total net sales in fiscal 2023?", ("revenue", "FY2023", 0)),
+        (
+            "What was net income in the previous fiscal year?",
+            ("net_income", None, 1),
+        ),
+        (
+            "How much did the company spend on R&D in 2022?",
+            ("research_and_development", "FY2022", 0),
+        ),
+        ("What was AAPL total assets in FY24?", ("total_assets", "FY2024", 0)),
+    ],
+)
+def test_plain_lookups_are_parsed(question, expected):
+    assert parse_numeric_question(question, NAMES) == expected
+
+
+@pytest.mark.parametrize(
+    "question",
+    [
+        "What was iPhone revenue in 2024?",
+        "What were net sales in Greater China in fiscal 2023?",
+        "What was revenue from Services in 2023?",
+        "What was the profit margin in 2023?",
+        "What was the revenue in the year before 2024?",
+        "What was net income in the fiscal year prior to 2023?",
+        "Why did revenue decrease in 2023?",
+    ],
+)
+def test_qualified_or_relative_questions_fall_back(question):
+    assert parse_numeric_question(question, NAMES) is None
+
+
+def test_line_items_skip_percent_columns_and_ragged_rows():
+    text = (
+        "(In millions)\n"
+        "2024 Change 2023 Change 2022\n"
+        "Total net sales $ 391,035 2 % $ 383,285 (3)% $ 394,328\n"
+        "Research and development $ 31,370 5 % $ 29,915\n"
+    )
+    assert extract_line_items(text) == [
+        ("revenue", 2024, 391_035e6),
+        ("revenue", 2023, 383_285e6),
+        ("revenue", 2022, 394_328e6),
+    ]
@@ -0,0 +1,70 @@
+"""Summary index upkeep as chunks are added, replaced and deleted."""
+
+import json
+
+import pytest
+
+pytest.importorskip("chromadb")
+
+from llama_index.core import Document
+
+from stockrag.index.builder import build_index
+from stockrag.index.hierarchy import get_summary_collection
+from stockrag.index.persistence import export_snapshot, import_snapshot
+from stockrag.maintenance.delete import delete_documents
+from stockrag.maintenance.update import update_with_new_data
+
+
+def _doc(path, sentences=20):
+    text = " ".join(f"Sentence {i} of {path} about revenue." for i in range(sentences))
+    return Document(text=text, metadata={"file_path": path, "source": "Annual Report"})
+
+
+def _summary_documents(ctx):
+    summaries = get_summary_collection(ctx)
+    page = summaries.get(where={"level": "document"}, include=["metadatas"])
+    return sorted(m["document_key"] for m in page["metadatas"])
+
+
+def test_build_index_updates_existing_summaries(rag_context):
+    ctx = rag_context
+    ctx.documents = [_doc("a.pdf"), _doc("b.pdf")]
+    build_index(ctx, show_progress=False, hierarchical=True)
+    assert _summary_documents(ctx) == ["a.pdf", "b.pdf"]
+
+    # A later, non-hierarchical build adds to the same store
+    ctx.documents = [_doc("c.pdf")]
+    build_index(ctx, show_progress=False)
+    assert _summary_documents(ctx) == ["a.pdf", "b.pdf", "c.pdf"]
+
+
+def test_delete_and_update_keep_summaries_in_step(rag_context):
+    ctx = rag_context
+    ctx.documents = [_doc("a.pdf"), _doc("b.pdf")]
+    build_index(ctx, show_progress=False, hierarchical=True)
+
+    delete_documents(ctx, file_path="a.pdf")
+    assert _summary_documents(ctx) == ["b.pdf"]
+
+    update_with_new_data(ctx, [_doc("d.pdf")])
+    assert _summary_documents(ctx) == ["b.pdf", "d.pdf"]
+
+    summaries = get_summary_collection(ctx)
+    sections = summaries.get(where={"level": "section"}, include=["metadatas"])
+    live = set(ctx.chroma_collection.get(include=[])["ids"])
+    for metadata in sections["metadatas"]:
+        assert set(json.loads(metadata["node_ids"])) <= live
+
+
+def test_import_of_flat_snapshot_drops_old_summaries(rag_context, tmp_path):
+    ctx = rag_context
+    ctx.documents = [_doc("a.pdf")]
+    build_index(ctx, show_progress=False)
+    export_snapshot(ctx, str(tmp_path / "flat"))
+
+    ctx.documents = [_doc("b.pdf")]
+    build_index(ctx, show_progress=False, hierarchical=True)
+    assert get_summary_collection(ctx) is not None
+
+    import_snapshot(ctx, str(tmp_path / "flat"), overwrite=True)
+    assert get_summary_collection(ctx) is None
@@ -0,0 +1,92 @@
+"""Ingest manifest keying by collection and resolved path."""
+
+import os
+import sqlite3
+
+import pytest
+
+pytest.importorskip("llama_index.core")
+
+from llama_index.core import Document
+
+from stockrag.loaders.manifest import IngestManifest
+
+
+class FakeCollection:
+    def __init__(self):
+        self.deleted = []
+
+    def get(self, where, include):
+        return {"ids": [f"{doc_id}-0" for doc_id in where["ref_doc_id"]["$in"]]}
+
+    def delete(self, ids):
+        self.deleted.extend(ids)
+
+
+@pytest.fixture
+def report(tmp_path):
+    path = tmp_path / "data" / "report.pdf"
+    path.parent.mkdir()
+    path.write_bytes(b"annual report")
+    return path
+
+
+def _ingest(manifest, location, doc_id):
+    state = manifest.check_file(location)
+    assert state is not None
+    manifest.stage(location, "Annual Report", [Document(text="x", id_=doc_id)], state)
+    collection = FakeCollection()
+    assert manifest.commit(collection) == 1
+    return collection
+
+
+def test_same_file_by_another_path_is_unchanged(tmp_path, report, monkeypatch):
+    manifest = IngestManifest(str(tmp_path / "manifest.sqlite"), "AAPL_kb")
+    _ingest(manifest, str(report), "d1")
+
+    monkeypatch.chdir(report.parent)
+    assert manifest.check_file("report.pdf") is None
+    assert manifest.check_file(os.path.join("..", "data", "report.pdf")) is None
+
+    os.symlink(report, tmp_path / "link.pdf")
+    assert manifest.check_file(str(tmp_path / "link.pdf")) is None
+
+    assert manifest.forget(["report.pdf"]) == 1
+    assert manifest.get(str(report)) is None
+
+
+def test_collections_sharing_a_manifest_are_separate(tmp_path, report):
+    path = str(tmp_path / "manifest.sqlite")
+    apple = IngestManifest(path, "AAPL_kb")
+    _ingest(apple, str(report), "d1")
+
+    microsoft = IngestManifest(path, "MSFT_kb")
+    assert microsoft.check_file(str(report)) is not None
+    collection = _ingest(microsoft, str(report), "d2")
+    # The other collection's chunks are not treated as stale
+    assert collection.deleted == []
+
+    assert apple.get(str(report))["chunk_ids"] == ["d1-0"]
+    assert microsoft.get(str(report))["chunk_ids"] == ["d2-0"]
+
+
+def test_location_keyed_manifest_is_migrated(tmp_path, report, monkeypatch):
+    path = str(tmp_path / "manifest.sqlite")
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE sources (location TEXT PRIMARY KEY, source TEXT NOT NULL, "
+        "size INTEGER, mtime_ns INTEGER, etag TEXT, last_modified TEXT, "
+        "content_hash TEXT NOT NULL, chunk_ids TEXT NOT NULL, "
+        "ingested_at REAL NOT NULL)"
+    )
+    stat = report.stat()
+    conn.execute(
+        "INSERT INTO sources VALUES (?, ?, ?, ?, NULL, NULL, ?, ?, 0)",
+        ("data/report.pdf", "Annual Report", stat.st_size, stat.st_mtime_ns, "h", "[]"),
+    )
+    conn.commit()
+    conn.close()
+
+    monkeypatch.chdir(tmp_path)
+    manifest = IngestManifest(path, "AAPL_kb")
+    assert manifest.check_file(str(report)) is None
@@ -0,0 +1,39 @@
+"""PCA projection: persisted size and evaluation at other dimensions."""
+
+import numpy as np
+import pytest
+
+pytest.importorskip("llama_index.core")
+
+from stockrag.core.exceptions import ConfigurationError
+from stockrag.index.reduction import EmbeddingReducer
+
+
+@pytest.fixture
+def vectors():
+    return np.random.default_rng(1).normal(size=(500, 384)).astype(np.float32)
+
+
+def test_fit_keeps_wider_components_but_saves_configured(vectors, tmp_path):
+    path = str(tmp_path / "projection.npz")
+    reducer = EmbeddingReducer("pca", 64, "model", path)
+    reducer.fit(vectors)
+
+    assert reducer.transform(vectors).shape == (500, 64)
+    assert reducer.transform(vectors, 256).shape == (500, 256)
+
+    reducer.save()
+    assert np.load(path)["components"].shape == (64, 384)
+
+    loaded = EmbeddingReducer.load_or_create("pca", 64, "model", path)
+    np.testing.assert_allclose(
+        loaded.transform(vectors), reducer.transform(vectors), rtol=1e-5, atol=1e-6
+    )
+    with pytest.raises(ConfigurationError):
+        loaded.transform(vectors, 256)
+
+
+def test_truncate_selects_leading_dimensions(vectors):
+    reducer = EmbeddingReducer("truncate", 64, "model", None)
+    assert reducer.transform(vectors).shape == (500, 64)
+    assert reducer.transform(vectors, 128).shape == (500, 128)
@@ -0,0 +1,128 @@
+"""LLM scheduler backoff and recovery against a local rate-limited endpoint."""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+pytest.importorskip("llama_index.core")
+
+from stockrag.core.config import RateLimitConfig
+from stockrag.llm.fake_endpoint import FakeLLMEndpoint, RateLimitError
+from stockrag.llm.scheduler import LLMScheduler
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_throttle_halves_limit_and_only_success_grows_it():
+    clock = FakeClock()
+    scheduler = LLMScheduler(
+        RateLimitConfig(max_concurrency=8, requests_per_minute=600), clock=clock
+    )
+    scheduler.acquire(10)
+    scheduler.release(10, throttled=True, retry_after=1.0)
+    assert scheduler.concurrency_limit == 4
+
+    for _ in range(3):
+        clock.now += 10
+        scheduler.acquire(10)
+        scheduler.release(10, succeeded=False)
+    assert scheduler.concurrency_limit == 4
+
+    clock.now += 10
+    scheduler.acquire(10)
+    scheduler.release(10)
+    assert scheduler._limit == pytest.approx(4.25)
+
+
+def test_backoff_and_recovery_against_fake_endpoint():
+    # The scheduler is configured far above what the endpoint allows, so
+    # it has to learn the real limit from 429s
+    config = RateLimitConfig(
+        requests_per_minute=60_000,
+        tokens_per_minute=10_000_000,
+        max_concurrency=8,
+        max_retries=50,
+        expected_output_tokens=1,
+    )
+    scheduler = LLMScheduler(config)
+    with FakeLLMEndpoint(requests_per_minute=600, burst=2, retry_after=0.2) as endpoint:
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(
+                pool.map(
+                    lambda i: scheduler.run(lambda: endpoint.complete(f"q{i}"), "q"),
+                    range(24),
+                )
+            )
+
+        assert results == ["OK"] * 24
+        assert endpoint.stats()["served"] == 24
+        assert endpoint.stats()["throttled"] > 0
+        assert scheduler.stats()["throttled"] == endpoint.stats()["throttled"]
+        backed_off = scheduler.concurrency_limit
+        assert backed_off < config.max_concurrency
+
+        # Paced under the endpoint's limit, every call succeeds and the
+        # concurrency limit grows back
+        for i in range(12):
+            time.sleep(0.15)
+            assert scheduler.run(lambda: endpoint.complete(f"r{i}"), "r") == "OK"
+        assert scheduler.concurrency_limit > backed_off
+
+
+def test_rate_limit_error_is_recognized():
+    with FakeLLMEndpoint(requests_per_minute=60, burst=1, retry_after=3) as endpoint:
+        endpoint.complete("first")
+        with pytest.raises(RateLimitError) as info:
+            endpoint.complete("second")
+
+    from stockrag.llm.scheduler import _retry_after, is_rate_limit_error
+
+    assert is_rate_limit_error(info.value)
+    assert _retry_after(info.value) == 3.0
+
+
+def test_wrapper_failures_do_not_grow_limit():
+    from llama_index.core.llms import MockLLM
+
+    from stockrag.llm.wrapper import RateLimitedLLM
+
+    scheduler = LLMScheduler(RateLimitConfig(max_concurrency=8), clock=FakeClock())
+    scheduler._limit = 4.0
+    llm = RateLimitedLLM(llm=MockLLM(), scheduler=scheduler)
+
+    async def failing_call():
+        raise ValueError("provider error")
+
+    def failing_stream():
+        yield "partial"
+        raise ValueError("provider error")
+
+    async def failing_astream():
+        async def gen():
+            yield "partial"
+            raise ValueError("provider error")
+
+        return gen()
+
+    async def drain_async(stream):
+        async for _ in stream:
+            pass
+
+    for _ in range(3):
+        with pytest.raises(ValueError):
+            asyncio.run(llm._arun(failing_call, "prompt"))
+        with pytest.raises(ValueError):
+            list(llm._stream(failing_stream, "prompt"))
+        with pytest.raises(ValueError):
+            asyncio.run(drain_async(llm._astream(failing_astream, "prompt")))
+
+    assert scheduler._limit == 4.0
+    assert scheduler.stats()["in_flight"] == 0
@@ -0,0 +1,53 @@
+"""Query worker pools over published snapshots."""
+
+import os
+
+import pytest
+
+pytest.importorskip("chromadb")
+
+from llama_index.core import Document
+
+from stockrag.index.builder import build_index
+from stockrag.query.workers import publish_snapshot, start_query_workers
+
+
+def _doc(path):
+    text = " ".join(f"Sentence {i} of {path} about revenue." for i in range(20))
+    return Document(text=text, metadata={"file_path": path})
+
+
+def test_refresh_does_not_touch_a_serving_snapshot(rag_context):
+    ctx = rag_context
+    ctx.documents = [_doc("a.pdf")]
+    build_index(ctx, show_progress=False)
+    snapshot_path = os.path.join(ctx.persist_path, "serving_snapshot")
+
+    with start_query_workers(ctx, workers=1, snapshot_path=snapshot_path) as pool:
+        served = os.path.realpath(snapshot_path)
+        assert os.path.islink(snapshot_path)
+        assert len(pool.retrieve("revenue", 3)) == 3
+        before = {
+            name: os.stat(os.path.join(served, name)).st_mtime_ns
+            for name in os.listdir(served)
+        }
+
+        ctx.documents = [_doc("b.pdf")]
+        build_index(ctx, show_progress=False)
+        publish_snapshot(ctx, snapshot_path)
+        assert os.path.realpath(snapshot_path) != served
+        assert {
+            name: os.stat(os.path.join(served, name)).st_mtime_ns
+            for name in os.listdir(served)
+        } == before
+        assert len(pool.retrieve("revenue", 3)) == 3
+
+    # Only the published version and the one before it are kept
+    publish_snapshot(ctx, snapshot_path)
+    versions = [
+        name
+        for name in os.listdir(ctx.persist_path)
+        if name.startswith("serving_snapshot.")
+    ]
+    assert len(versions) == 2
+    assert served not in [os.path.join(ctx.persist_path, v) for v in versions]